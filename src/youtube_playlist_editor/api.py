@@ -1,41 +1,220 @@
+import os
+import json
 import logging
 import click
 import sys
 import time # Added for potential backoff
-from typing import Optional
+import random
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TYPE_CHECKING
 
-from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
 # Consider using tenacity for more robust retries
 # from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 MAX_RETRIES = 3
 INITIAL_BACKOFF = 1 # seconds
+QUOTA_EXCEEDED_MESSAGE = "Error: The YouTube Data API daily quota has been exceeded. Try again after it resets (midnight Pacific Time)."
+
+# Per-request retry policy used by _execute_with_retry
+REQUEST_MAX_TRIES = 5
+REQUEST_BASE_BACKOFF = 0.5 # seconds
+REQUEST_MAX_BACKOFF = 30 # seconds
+REQUEST_MAX_JITTER = 0.25 # seconds
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504) # Rate limited or transient server errors
+REJECTED_STATUSES = (429, 503) # Refused before processing, so even a non-idempotent request can be re-sent
+AMBIGUOUS_INSERT_STATUSES = (500, 502, 504) # The insert may have been applied before the error
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"}) # Sent as 403, but transient
+
+BATCH_SIZE = 50 # Max sub-requests per batch HTTP call recommended for Google APIs
+MAX_BATCH_WORKERS = 4 # Keep modest: YouTube may drop concurrent inserts into one playlist
+
+# Response mask for videos.list availability checks: only the IDs that exist and are visible
+VIDEO_IDS_FIELDS = "items(id)"
+# Server-side response mask for playlistItems.list: trims each page to the video IDs and the page token
+PLAYLIST_ITEMS_FIELDS = "items(contentDetails/videoId),nextPageToken"
+# Response mask for the playlistItems.list call that checks whether one video is already in the playlist
+PLAYLIST_MEMBERSHIP_FIELDS = "items(id)"
+# Response mask for the cheap playlists.list call used to validate the local cache
+PLAYLIST_STATE_FIELDS = "items(etag,contentDetails/itemCount)"
+
+# Local mirror of each playlist's video IDs, reused while the playlist is unchanged
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "youtube-playlist-editor"
+
+# --- Request Execution ---
+
+def _backoff_delay(attempt: int, base: float = REQUEST_BASE_BACKOFF) -> float:
+    """Capped exponential backoff for a zero-based attempt, plus random jitter so clients don't retry in lockstep."""
+    return min(REQUEST_MAX_BACKOFF, base * (2 ** attempt)) + random.uniform(0, REQUEST_MAX_JITTER)
+
+def _retry_delay(e: HttpError, attempt: int, base: float = REQUEST_BASE_BACKOFF) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else capped backoff with jitter."""
+    retry_after = e.resp.get("retry-after")
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass # HTTP-date form; fall back to backoff
+    return _backoff_delay(attempt, base)
+
+def _error_reasons(e: HttpError) -> set[str]:
+    """Returns the machine-readable reasons (e.g. 'playlistNotFound') of an API error.
+
+    The codes are read from the body's error.errors[*].reason. HttpError.error_details is
+    only a fallback: googleapiclient fills it from error.details when the body has one,
+    and those entries carry different reason codes.
+    """
+    try:
+        errors = json.loads(e.content)["error"]["errors"]
+        reasons = {error["reason"] for error in errors if isinstance(error, dict) and "reason" in error}
+    except (ValueError, TypeError, KeyError): # Not JSON, or not the usual error shape
+        reasons = set()
+    if reasons:
+        return reasons
+    details = getattr(e, "error_details", None)
+    if not isinstance(details, list):
+        return set()
+    return {detail.get("reason") for detail in details if isinstance(detail, dict)}
+
+def _is_retryable(e: HttpError, idempotent: bool = True) -> bool:
+    """Whether a failed request can be re-sent as is: a retryable status, or a 403 that only reports a rate limit."""
+    statuses = RETRYABLE_STATUSES if idempotent else REJECTED_STATUSES
+    return e.resp.status in statuses or bool(_error_reasons(e) & RATE_LIMIT_REASONS)
+
+def _is_quota_exceeded(e: HttpError) -> bool:
+    """Whether the project's daily quota is used up; no request succeeds until it resets."""
+    return e.resp.status == 403 and "quotaExceeded" in _error_reasons(e)
+
+class QuotaExceededError(Exception):
+    """Raised when an insert fails because the daily API quota is used up."""
+
+def _execute_with_retry(request, max_tries: int = REQUEST_MAX_TRIES, idempotent: bool = True):
+    """Executes an API request, retrying rate-limit (429, or 403 with a rate-limit
+    reason) and 5xx responses, as well as timeouts and dropped connections.
+
+    A request that timed out, lost its connection or failed with 500/502/504 may still
+    have been applied. Those failures are only retried for idempotent requests (reads);
+    for others (e.g. inserts) only 429/503 are retried and the rest are re-raised for
+    the caller to resolve.
+
+    Non-retryable errors, and the error from the final attempt, are re-raised.
+    """
+    for attempt in range(max_tries):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not _is_retryable(e, idempotent) or attempt + 1 >= max_tries:
+                raise
+            wait_time = _retry_delay(e, attempt)
+            logging.warning(f"Attempt {attempt + 1}/{max_tries}: API Error ({e.resp.status}): {e}. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
+        except (TimeoutError, ConnectionError) as e: # socket.timeout is an alias of TimeoutError
+            if not idempotent or attempt + 1 >= max_tries:
+                raise
+            wait_time = _backoff_delay(attempt)
+            logging.warning(f"Attempt {attempt + 1}/{max_tries}: Network error: {e!r}. Retrying in {wait_time:.2f}s...")
+            time.sleep(wait_time)
+
+# --- Playlist Cache ---
+
+def _cache_path(playlist_id: str) -> Path:
+    return CACHE_DIR / f"{playlist_id}.json"
+
+def _load_cache(playlist_id: str) -> Optional[tuple[str, int, set[str]]]:
+    """Loads (etag, item count, video IDs) cached for the playlist, or None if unavailable."""
+    cache_path = _cache_path(playlist_id)
+    if not cache_path.exists():
+        return None
+    try:
+        data = json.loads(cache_path.read_text())
+        return data["etag"], data["item_count"], set(data["video_ids"])
+    except Exception as e:
+        logging.warning(f"Could not read playlist cache {cache_path}: {e}. Ignoring it.")
+        return None
+
+def _save_cache(playlist_id: str, etag: str, item_count: int, video_ids: set[str]) -> None:
+    """Writes the playlist's video IDs to the cache along with the state they were fetched at."""
+    cache_path = _cache_path(playlist_id)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({"etag": etag, "item_count": item_count, "video_ids": sorted(video_ids)}))
+        logging.info(f"Cached {len(video_ids)} video IDs for playlist '{playlist_id}' in {cache_path}")
+    except Exception as e:
+        logging.warning(f"Could not write playlist cache {cache_path}: {e}")
+
+def _get_playlist_state(youtube: "Resource", playlist_id: str) -> Optional[tuple[str, int]]:
+    """Fetches the playlist's etag and item count with a single list call (1 quota unit).
+
+    Returns None if the state could not be determined, in which case the cache is bypassed.
+    """
+    try:
+        response = _execute_with_retry(youtube.playlists().list(
+            part="contentDetails",
+            id=playlist_id,
+            fields=PLAYLIST_STATE_FIELDS
+        ))
+    except Exception as e:
+        logging.warning(f"Could not fetch state of playlist '{playlist_id}' for cache validation: {e}")
+        return None
+    items = response.get("items")
+    if not items:
+        return None
+    return items[0].get("etag"), items[0].get("contentDetails", {}).get("itemCount")
 
 # --- Playlist Management ---
 
-def get_existing_playlist_video_ids(youtube: Resource, playlist_id: str) -> set[str]:
-    """Fetches all video IDs currently in the specified playlist with retry logic."""
+def get_existing_playlist_video_ids(youtube: "Resource", playlist_id: str, use_cache: bool = True) -> Optional[set[str]]:
+    """Fetches all video IDs currently in the specified playlist with retry logic.
+
+    The first page request doubles as the playlist validity check, so no separate
+    playlists.list round-trip is needed before adding videos.
+
+    The IDs are cached on disk per playlist; when the playlist's etag and item count
+    still match the cached ones, the cached set is returned without paginating.
+    With use_cache=False the playlist is always re-read (and the cache rewritten).
+
+    Returns:
+        Optional[set[str]]: The existing video IDs (empty if they could not be fetched),
+        or None if the playlist was not found or is not accessible.
+    """
     existing_ids = set()
     next_page_token = None
     attempt = 0
 
+    # Reuse the cached IDs if the playlist has not changed since they were fetched
+    playlist_state = _get_playlist_state(youtube, playlist_id)
+    if playlist_state is not None and use_cache:
+        cached = _load_cache(playlist_id)
+        if cached is not None and cached[:2] == playlist_state:
+            logging.info(f"Playlist '{playlist_id}' is unchanged since the last run; using {len(cached[2])} cached video IDs.")
+            return cached[2]
+    # The state call already proved the playlist is accessible; an empty one needs no page fetch
+    if playlist_state is not None and playlist_state[1] == 0:
+        logging.info(f"Playlist '{playlist_id}' is empty; no existing video IDs to fetch.")
+        return existing_ids
+
     logging.info(f"Fetching existing video IDs from playlist '{playlist_id}'...")
 
     while attempt < MAX_RETRIES:
         try:
             while True:
                 request = youtube.playlistItems().list(
-                    part="snippet",
+                    part="contentDetails", # Only need the video ID, not titles/thumbnails
                     playlistId=playlist_id,
                     maxResults=50, # Max allowed by API
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields=PLAYLIST_ITEMS_FIELDS
                 )
                 response = request.execute()
 
                 for item in response.get("items", []):
-                    video_id = item.get("snippet", {}).get("resourceId", {}).get("videoId")
+                    video_id = item.get("contentDetails", {}).get("videoId")
                     if video_id:
                         existing_ids.add(video_id)
 
@@ -46,14 +225,20 @@ def get_existing_playlist_video_ids(youtube: Resource, playlist_id: str) -> set[
             break
         except HttpError as e:
             attempt += 1
-            wait_time = INITIAL_BACKOFF * (2 ** (attempt - 1)) # Exponential backoff
-            logging.warning(f"Attempt {attempt}/{MAX_RETRIES}: API Error fetching existing playlist items: {e}. Retrying in {wait_time}s...")
+            wait_time = _retry_delay(e, attempt - 1, base=INITIAL_BACKOFF) # Exponential backoff with jitter
+            logging.warning(f"Attempt {attempt}/{MAX_RETRIES}: API Error fetching existing playlist items: {e}. Retrying in {wait_time:.2f}s...")
 
-            if e.resp.status == 404: # Playlist genuinely not found during fetch
-                logging.error(f"Playlist '{playlist_id}' not found while fetching existing items.")
-                click.echo(f"Error: Playlist ID '{playlist_id}' seems to have become inaccessible after the initial check.", err=True)
-                return set()
-            elif e.resp.status in [500, 502, 503, 504]: # Common transient errors
+            reasons = _error_reasons(e)
+            if _is_quota_exceeded(e): # Daily quota used up; retrying won't help
+                logging.error(f"YouTube API quota exceeded while fetching existing items of playlist '{playlist_id}'.")
+                click.echo(QUOTA_EXCEEDED_MESSAGE, err=True)
+                return None
+            # Playlist not found, or (on the very first page) not accessible to this user
+            elif e.resp.status == 404 or (e.resp.status == 403 and next_page_token is None and not reasons & RATE_LIMIT_REASONS):
+                logging.error(f"Playlist '{playlist_id}' not found or not accessible while fetching existing items.")
+                click.echo(f"Error: Playlist ID '{playlist_id}' not found or you do not have access to it.", err=True)
+                return None
+            elif _is_retryable(e): # Rate limited or transient server errors
                 if attempt >= MAX_RETRIES:
                     logging.error(f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to API server errors.")
                     click.echo(f"Error: Failed to retrieve existing videos from playlist '{playlist_id}' due to API server errors.", err=True)
@@ -66,8 +251,8 @@ def get_existing_playlist_video_ids(youtube: Resource, playlist_id: str) -> set[
 
         except Exception as e:
              attempt += 1
-             wait_time = INITIAL_BACKOFF * (2 ** (attempt - 1))
-             logging.warning(f"Attempt {attempt}/{MAX_RETRIES}: Unexpected error fetching existing playlist items: {e}. Retrying in {wait_time}s...")
+             wait_time = _backoff_delay(attempt - 1, base=INITIAL_BACKOFF)
+             logging.warning(f"Attempt {attempt}/{MAX_RETRIES}: Unexpected error fetching existing playlist items: {e}. Retrying in {wait_time:.2f}s...")
              if attempt >= MAX_RETRIES:
                 logging.error(f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to unexpected error: {e}")
                 click.echo(f"Error: An unexpected error occurred retrieving existing videos from playlist '{playlist_id}'.", err=True)
@@ -76,82 +261,284 @@ def get_existing_playlist_video_ids(youtube: Resource, playlist_id: str) -> set[
 
 
     logging.info(f"Found {len(existing_ids)} existing video IDs in the playlist.")
+    if playlist_state is not None:
+        _save_cache(playlist_id, *playlist_state, existing_ids)
     return existing_ids
 
-def add_video_to_playlist(youtube: Resource, playlist_id: str, video_id: str) -> bool:
-    """Adds a single video to the specified playlist."""
-    try:
-        request = youtube.playlistItems().insert(
-            part="snippet",
-            body={
-                "snippet": {
-                    "playlistId": playlist_id,
-                    "resourceId": {
-                        "kind": "youtube#video",
-                        "videoId": video_id
-                    }
+def get_available_video_ids(youtube: "Resource", video_ids: list[str]) -> set[str]:
+    """Returns the subset of video_ids that exist and are visible to the user.
+
+    Checks up to BATCH_SIZE IDs per videos.list call (1 quota unit, versus 50 for an
+    insert), so deleted or private videos can be skipped instead of failing their insert.
+    If a check fails, the IDs in that chunk are assumed available and left to the insert.
+    """
+    available_ids = set()
+    for i in range(0, len(video_ids), BATCH_SIZE):
+        chunk = video_ids[i:i + BATCH_SIZE]
+        try:
+            response = _execute_with_retry(youtube.videos().list(
+                part="id",
+                id=",".join(chunk),
+                fields=VIDEO_IDS_FIELDS
+            ))
+        except Exception as e:
+            logging.warning(f"Could not check availability of {len(chunk)} videos: {e}. Will attempt to add them anyway.")
+            available_ids.update(chunk)
+            continue
+        available_ids.update(item["id"] for item in response.get("items", []) if "id" in item)
+    return available_ids
+
+def _insert_request(youtube: "Resource", playlist_id: str, video_id: str):
+    """Builds (but does not execute) a playlistItems.insert request for one video."""
+    return youtube.playlistItems().insert(
+        part="snippet",
+        body={
+            "snippet": {
+                "playlistId": playlist_id,
+                "resourceId": {
+                    "kind": "youtube#video",
+                    "videoId": video_id
                 }
             }
-        )
-        response = request.execute()
-        logging.info(f"Successfully added video ID '{video_id}' to playlist '{playlist_id}'. Response: {response.get('id')}")
-        return True
-    except HttpError as e:
-        # Handle common API errors
-        if e.resp.status == 404:
-             if "playlistNotFound" in str(e.content):
-                 logging.error(f"Playlist '{playlist_id}' not found when trying to add video '{video_id}'.")
-                 click.echo(f"Error: Playlist ID '{playlist_id}' was not found. Please check the ID.", err=True)
-             elif "videoNotFound" in str(e.content):
-                 logging.warning(f"Video ID '{video_id}' not found or private. Skipping.")
-             else:
-                 logging.error(f"API Error (404) adding video '{video_id}': {e}")
-        elif e.resp.status == 403:
-            # Could be quota, permissions, terms of service etc.
-            logging.error(f"Permission denied (403) adding video '{video_id}'. Check API key/OAuth scopes, quota, or video/playlist permissions: {e}")
-            click.echo(f"Error: Permission denied when adding video '{video_id}'. Check API/OAuth setup or playlist settings.", err=True)
-        elif e.resp.status == 409: # Conflict - often means video already in playlist
-             # Note: Our deduplication check should prevent this, but API might have edge cases
-             logging.warning(f"Video ID '{video_id}' might already be in the playlist '{playlist_id}' (API reported 409 Conflict). Skipping.")
-        elif e.resp.status in [500, 502, 503, 504]: # Transient server errors
-             logging.warning(f"API Server Error ({e.resp.status}) occurred adding video '{video_id}': {e}. This might resolve on its own later.")
-             # Don't necessarily treat as fatal, but report
-        else:
-            logging.error(f"An unexpected HTTP error occurred adding video '{video_id}': {e}")
-        return False
-    except Exception as e:
-        logging.error(f"An unexpected error occurred adding video '{video_id}': {e}")
-        return False
+        }
+    )
+
+def _is_in_playlist(youtube: "Resource", playlist_id: str, video_id: str) -> Optional[bool]:
+    """Checks whether the video is in the playlist with one filtered playlistItems.list call (1 quota unit).
 
-def verify_playlist_exists(youtube: Resource, playlist_id: str) -> bool:
-    """Checks if a playlist exists and is accessible."""
-    logging.info(f"Verifying playlist ID: {playlist_id}")
+    Inserts are not idempotent, so this is asked before re-sending an insert that may
+    already have been applied. Returns None if the check itself failed.
+    """
     try:
-        request = youtube.playlists().list(
+        response = _execute_with_retry(youtube.playlistItems().list(
             part="id",
-            id=playlist_id,
-            maxResults=1
-        )
-        response = request.execute()
-        if not response.get("items"):
-            # This case might occur if the ID has a valid format but doesn't exist
-            # or user lacks permissions
-            logging.error(f"Playlist ID '{playlist_id}' not found or user does not have access.")
-            click.echo(f"Error: Playlist ID '{playlist_id}' not found or you do not have access to it.", err=True)
-            return False
-        logging.info(f"Playlist ID '{playlist_id}' is valid and accessible.")
-        return True
+            playlistId=playlist_id,
+            videoId=video_id,
+            maxResults=1,
+            fields=PLAYLIST_MEMBERSHIP_FIELDS
+        ))
+    except Exception as e:
+        logging.error(f"Could not check whether video '{video_id}' is already in playlist '{playlist_id}': {e}")
+        return None
+    return bool(response.get("items"))
 
-    except HttpError as e:
-        logging.error(f"API Error verifying playlist ID '{playlist_id}': {e}")
-        if e.resp.status == 404:
+def _log_add_http_error(e: HttpError, playlist_id: str, video_id: str) -> None:
+    """Reports an HttpError raised while adding a single video."""
+    # Handle common API errors
+    if e.resp.status == 404:
+         reasons = _error_reasons(e)
+         if "playlistNotFound" in reasons:
+             logging.error(f"Playlist '{playlist_id}' not found when trying to add video '{video_id}'.")
              click.echo(f"Error: Playlist ID '{playlist_id}' was not found. Please check the ID.", err=True)
-        elif e.resp.status == 403:
-             click.echo(f"Error: Permission denied when trying to access playlist '{playlist_id}'. Check API key/OAuth scopes or playlist permissions.", err=True)
+         elif "videoNotFound" in reasons:
+             logging.warning(f"Video ID '{video_id}' not found or private. Skipping.")
+         else:
+             logging.error(f"API Error (404) adding video '{video_id}': {e}")
+    elif e.resp.status == 403 and _error_reasons(e) & RATE_LIMIT_REASONS:
+        logging.warning(f"Rate limited (403) adding video '{video_id}', even after retrying: {e}")
+    elif e.resp.status == 403:
+        # Could be quota, permissions, terms of service etc.
+        logging.error(f"Permission denied (403) adding video '{video_id}'. Check API key/OAuth scopes, quota, or video/playlist permissions: {e}")
+        click.echo(f"Error: Permission denied when adding video '{video_id}'. Check API/OAuth setup or playlist settings.", err=True)
+    elif e.resp.status == 409: # Conflict - often means video already in playlist
+         # Note: Our deduplication check should prevent this, but API might have edge cases
+         logging.warning(f"Video ID '{video_id}' might already be in the playlist '{playlist_id}' (API reported 409 Conflict). Skipping.")
+    elif e.resp.status in [500, 502, 503, 504]: # Transient server errors
+         logging.warning(f"API Server Error ({e.resp.status}) occurred adding video '{video_id}': {e}. This might resolve on its own later.")
+         # Don't necessarily treat as fatal, but report
+    else:
+        logging.error(f"An unexpected HTTP error occurred adding video '{video_id}': {e}")
+
+def add_video_to_playlist(youtube: "Resource", playlist_id: str, video_id: str) -> bool:
+    """Adds a single video to the specified playlist.
+
+    If the insert times out, loses its connection or fails with 500/502/504, it may
+    still have been applied, so it is only re-sent after the playlist is confirmed
+    not to contain the video.
+
+    Raises QuotaExceededError if the daily quota is used up, since no further insert
+    can succeed.
+    """
+    for attempt in range(REQUEST_MAX_TRIES):
+        try:
+            request = _insert_request(youtube, playlist_id, video_id)
+            response = _execute_with_retry(request, idempotent=False)
+            logging.debug(f"Successfully added video ID '{video_id}' to playlist '{playlist_id}'. Response: {response.get('id')}")
+            return True
+        except HttpError as e:
+            if _is_quota_exceeded(e):
+                raise QuotaExceededError(f"Daily quota exceeded adding video '{video_id}'") from e
+            if e.resp.status not in AMBIGUOUS_INSERT_STATUSES:
+                _log_add_http_error(e, playlist_id, video_id)
+                return False
+            error = e
+        except (TimeoutError, ConnectionError) as e:
+            error = e
+        except Exception as e:
+            logging.error(f"An unexpected error occurred adding video '{video_id}': {e}")
+            return False
+
+        in_playlist = _is_in_playlist(youtube, playlist_id, video_id)
+        if in_playlist:
+            logging.info(f"Video ID '{video_id}' is in playlist '{playlist_id}' despite the error ({error!r}). Not re-adding it.")
+            return True
+        if in_playlist is None or attempt + 1 >= REQUEST_MAX_TRIES:
+            if isinstance(error, HttpError):
+                _log_add_http_error(error, playlist_id, video_id)
+            else:
+                logging.error(f"Failed to add video '{video_id}' due to a network error: {error!r}")
+            return False
+        wait_time = _backoff_delay(attempt)
+        logging.warning(f"Attempt {attempt + 1}/{REQUEST_MAX_TRIES}: Error adding video '{video_id}': {error!r}. It is not in the playlist; retrying in {wait_time:.2f}s...")
+        time.sleep(wait_time)
+
+def _new_authorized_http(youtube: "Resource"):
+    """Returns a fresh authorized transport for use on a worker thread.
+
+    httplib2.Http objects are not thread-safe, so each batch worker thread needs
+    its own. Returns None (use the service's default transport) when the
+    service was not built from credentials.
+    """
+    credentials = getattr(getattr(youtube, "_http", None), "credentials", None)
+    if credentials is None:
+        return None
+    import google_auth_httplib2
+    from googleapiclient.http import build_http
+    # build_http() matches the service's own transport: keep-alive, a default timeout and 308 not treated as a redirect
+    return google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+
+def _report_quota_exceeded(quota_exceeded: threading.Event, playlist_id: str) -> None:
+    """Reports, once per run, that inserts stopped because the daily quota ran out."""
+    if quota_exceeded.is_set():
+        logging.error(f"YouTube API quota exceeded while adding videos to playlist '{playlist_id}'. Remaining videos were not added.")
+        click.echo(QUOTA_EXCEEDED_MESSAGE, err=True)
+
+def add_videos_to_playlist(youtube: "Resource", playlist_id: str, video_ids: list[str],
+                           on_progress: Optional[Callable[[str, bool], None]] = None,
+                           keep_order: bool = False) -> dict[str, bool]:
+    """Adds many videos to the playlist using batched HTTP requests.
+
+    Inserts are grouped into batches of BATCH_SIZE sub-requests (one HTTP round-trip
+    per batch) and up to MAX_BATCH_WORKERS batches run in parallel. Sub-requests that
+    were refused (429/503, or a rate-limit 403) are retried once, one at a time.
+    Sub-requests that failed with a conflict (409) or 500/502/504, and the videos of a
+    batch request that failed as a whole, may still have been applied, so they are
+    only re-sent once the playlist is confirmed not to contain them.
+    Neither parallel batches nor the sub-requests within a batch are applied in a
+    guaranteed order, so the videos may land in the playlist in any order. With
+    keep_order=True they are instead inserted one at a time, in the order given.
+
+    If the daily quota runs out, the remaining videos are not sent (they are reported
+    as not added) and the quota error is reported once.
+
+    If given, on_progress(video_id, added) is called once per video as its final
+    result is known (serialized, never from two threads at once).
+
+    Returns:
+        dict[str, bool]: Maps each video ID to whether it was added successfully.
+    """
+    results: dict[str, bool] = {}
+    retry_ids: list[str] = []
+    unconfirmed_ids: list[str] = [] # Failed inserts that may or may not have been applied
+    lock = threading.Lock()
+    quota_exceeded = threading.Event() # Once set, no further inserts are sent
+
+    def record_result(video_id: str, added: bool) -> None:
+        with lock:
+            results[video_id] = added
+            if on_progress is not None:
+                on_progress(video_id, added)
+
+    def add_one(video_id: str) -> None:
+        """Inserts a single video (unless the quota already ran out) and records the result."""
+        added = False
+        if not quota_exceeded.is_set():
+            try:
+                added = add_video_to_playlist(youtube, playlist_id, video_id)
+            except QuotaExceededError:
+                quota_exceeded.set()
+        record_result(video_id, added)
+
+    def on_result(request_id, response, exception):
+        video_id = request_id
+        if exception is None:
+            logging.debug(f"Successfully added video ID '{video_id}' to playlist '{playlist_id}'. Response: {response.get('id')}")
+            record_result(video_id, True)
+        elif isinstance(exception, HttpError) and _is_quota_exceeded(exception):
+            quota_exceeded.set()
+            record_result(video_id, False)
+        elif isinstance(exception, HttpError) and _is_retryable(exception, idempotent=False):
+            logging.warning(f"Batch insert of video ID '{video_id}' failed with status {exception.resp.status}. Will retry individually.")
+            with lock:
+                retry_ids.append(video_id)
+        elif isinstance(exception, HttpError) and (exception.resp.status == 409 or exception.resp.status in AMBIGUOUS_INSERT_STATUSES):
+            logging.warning(f"Batch insert of video ID '{video_id}' failed with status {exception.resp.status}. Will check the playlist before retrying it.")
+            with lock:
+                unconfirmed_ids.append(video_id)
         else:
-             click.echo(f"Error: An API error occurred while verifying playlist ID '{playlist_id}': {e}", err=True)
-        return False
-    except Exception as e:
-        logging.error(f"An unexpected error occurred verifying playlist ID '{playlist_id}': {e}")
-        click.echo(f"An unexpected error occurred while verifying playlist ID: {e}", err=True)
-        return False 
\ No newline at end of file
+            if isinstance(exception, HttpError):
+                _log_add_http_error(exception, playlist_id, video_id)
+            else:
+                logging.error(f"An unexpected error occurred adding video '{video_id}': {exception}")
+            record_result(video_id, False)
+
+    if keep_order:
+        logging.info(f"Adding {len(video_ids)} videos to playlist '{playlist_id}' one at a time to keep their order...")
+        for video_id in video_ids:
+            add_one(video_id)
+        _report_quota_exceeded(quota_exceeded, playlist_id)
+        return results
+
+    # One transport per worker thread, reused for every batch that thread runs, so its
+    # kept-alive connection saves a TCP/TLS handshake per batch after the first.
+    worker_state = threading.local()
+
+    def worker_http():
+        if not hasattr(worker_state, "http"):
+            worker_state.http = _new_authorized_http(youtube)
+        return worker_state.http
+
+    def execute_batch(chunk: list[str]) -> None:
+        if quota_exceeded.is_set():
+            for video_id in chunk:
+                record_result(video_id, False)
+            return
+        batch = youtube.new_batch_http_request(callback=on_result)
+        for video_id in chunk:
+            batch.add(_insert_request(youtube, playlist_id, video_id), request_id=video_id)
+        try:
+            batch.execute(http=worker_http())
+        except Exception as e:
+            # The whole batch request failed (e.g. a timeout), possibly after the server applied it
+            logging.warning(f"Batch request of {len(chunk)} inserts failed: {e}. Will check the playlist before retrying them.")
+            with lock:
+                # Sub-responses that arrived before the failure already recorded or queued their video
+                handled = set(results).union(retry_ids, unconfirmed_ids)
+                unconfirmed_ids.extend(video_id for video_id in chunk if video_id not in handled)
+
+    chunks = [video_ids[i:i + BATCH_SIZE] for i in range(0, len(video_ids), BATCH_SIZE)]
+    logging.info(f"Adding {len(video_ids)} videos to playlist '{playlist_id}' in {len(chunks)} batch request(s)...")
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(chunks))) as pool:
+            # list() re-raises any unexpected exception from a worker
+            list(pool.map(execute_batch, chunks))
+
+    # Re-sending an applied insert would add a duplicate, so only retry videos confirmed missing
+    for video_id in unconfirmed_ids:
+        if quota_exceeded.is_set():
+            record_result(video_id, False)
+            continue
+        in_playlist = _is_in_playlist(youtube, playlist_id, video_id)
+        if in_playlist:
+            logging.info(f"Video ID '{video_id}' is in playlist '{playlist_id}' despite its failed batch insert. Not re-adding it.")
+            record_result(video_id, True)
+        elif in_playlist is False:
+            retry_ids.append(video_id)
+        else:
+            record_result(video_id, False)
+
+    for video_id in retry_ids:
+        add_one(video_id)
+
+    _report_quota_exceeded(quota_exceeded, playlist_id)
+    return results
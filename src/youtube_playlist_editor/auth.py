@@ -1,25 +1,23 @@
 import logging
 import sys
-import pickle
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import click
-from googleapiclient.discovery import build, Resource
 from googleapiclient.errors import HttpError
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
 
 # Constants - Consider moving these to a config module or loading from env
 CLIENT_SECRETS_FILE = "client_secrets.json" # Path relative to project root
-TOKEN_PICKLE_FILE = "token.pickle"           # Path relative to project root
+TOKEN_FILE = "token.json"                    # Path relative to project root
 API_SERVICE_NAME = "youtube"
 API_VERSION = "v3"
 SCOPES = ["https://www.googleapis.com/auth/youtube"]
 
 
-def get_authenticated_service() -> Optional[Resource]:
+def get_authenticated_service() -> Optional["Resource"]:
     """Authenticates with the YouTube API using OAuth 2.0.
 
     Handles token loading, refreshing, and the initial OAuth flow.
@@ -27,13 +25,20 @@ def get_authenticated_service() -> Optional[Resource]:
     Returns:
         Optional[Resource]: An authenticated YouTube API service object, or None if authentication fails.
     """
+    # Heavy Google client imports are deferred to here so CLI startup (e.g. --help) stays fast
+    from googleapiclient.discovery import build
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from .json_model import get_json_model
+
     credentials = None # Initialize credentials to None
     # Determine paths relative to the project root or a defined config location
     # For simplicity now, assuming they are in the root where the script might be invoked from
     # Or, more robustly, define them relative to this file's location if structure is fixed
     # Or use environment variables / dedicated config dir
     base_path = Path() # Current working directory assumption - might need adjustment
-    token_path = base_path / TOKEN_PICKLE_FILE
+    token_path = base_path / TOKEN_FILE
     secrets_path = base_path / CLIENT_SECRETS_FILE
 
     if not secrets_path.exists():
@@ -44,8 +49,8 @@ def get_authenticated_service() -> Optional[Resource]:
     # Attempt to load existing credentials
     if token_path.exists():
         try:
-            with open(token_path, "rb") as token_file:
-                loaded_creds = pickle.load(token_file)
+            # Plain JSON (no unpickling of arbitrary objects)
+            loaded_creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
             logging.info(f"Loaded credentials from {token_path}")
 
             # Check validity and expiry *after* loading
@@ -59,8 +64,7 @@ def get_authenticated_service() -> Optional[Resource]:
                     credentials = loaded_creds # Use refreshed credentials
                     # Save refreshed token immediately
                     try:
-                        with open(token_path, "wb") as token_file:
-                            pickle.dump(credentials, token_file)
+                        token_path.write_text(credentials.to_json())
                         logging.info(f"Refreshed credentials saved to {token_path}")
                     except Exception as save_e:
                         logging.error(f"Failed to save refreshed token to {token_path}: {save_e}")
@@ -103,8 +107,7 @@ def get_authenticated_service() -> Optional[Resource]:
 
             # Save the new credentials immediately after successful flow
             try:
-                with open(token_path, "wb") as token_file:
-                    pickle.dump(credentials, token_file)
+                token_path.write_text(credentials.to_json())
                 logging.info(f"New credentials saved to {token_path}")
             except Exception as e:
                  logging.error(f"Failed to save new token to {token_path}: {e}")
@@ -130,7 +133,9 @@ def get_authenticated_service() -> Optional[Resource]:
          return None
 
     try:
-        service = build(API_SERVICE_NAME, API_VERSION, credentials=credentials)
+        # Use the discovery document bundled with google-api-python-client: no HTTP fetch at startup
+        service = build(API_SERVICE_NAME, API_VERSION, credentials=credentials, model=get_json_model(),
+                        static_discovery=True, cache_discovery=False)
         logging.info(f"Successfully built YouTube {API_VERSION} service.")
         return service
     except HttpError as e:
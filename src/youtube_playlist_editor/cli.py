@@ -1,22 +1,32 @@
 import click
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Import functions from other modules
 from .auth import get_authenticated_service
-from .api import get_existing_playlist_video_ids, add_video_to_playlist, verify_playlist_exists
-from .utils import extract_video_id
+from .api import get_existing_playlist_video_ids, get_available_video_ids, add_videos_to_playlist
+from .utils import extract_video_id, iter_url_lines
 
 # Configure logging (can be configured once at the top level)
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+def _extract_all_ids(file: Path) -> list[tuple[int, str, Optional[str]]]:
+    """Reads the URL file and returns (line number, URL, video ID or None) for each URL line."""
+    # Empty lines and comments are skipped while reading
+    return [(line_num, url, extract_video_id(url)) for line_num, url in iter_url_lines(file)]
+
 @click.group()
-def cli():
+@click.option('--verbose', '-v', is_flag=True, default=False,
+              help='Show per-video DEBUG log messages.')
+def cli(verbose: bool):
     """A CLI tool to manage YouTube playlists."""
-    pass
+    if verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
 
 @cli.command()
 @click.option('--file', '-f', required=True,
@@ -24,62 +34,51 @@ def cli():
               help='Path to the file containing YouTube video URLs (one URL per line).')
 @click.option('--playlist-id', '-p', required=True, type=str,
               help='The ID of the YouTube playlist to add videos to.')
-def add(file: Path, playlist_id: str):
-    """Adds videos from a file to a YouTube playlist."""
-    logging.info(f"Starting to add videos from '{file}' to playlist '{playlist_id}'.")
+@click.option('--refresh-cache', is_flag=True, default=False,
+              help='Re-read the playlist instead of using the cached list of its videos.')
+@click.option('--keep-order', is_flag=True, default=False,
+              help='Add the videos one at a time, in file order (slower).')
+def add(file: Path, playlist_id: str, refresh_cache: bool, keep_order: bool):
+    """Adds videos from a file to a YouTube playlist.
 
-    youtube = get_authenticated_service()
-    if not youtube:
-        click.echo("Failed to authenticate with YouTube API. Exiting.", err=True)
-        sys.exit(1)
+    By default videos are sent in parallel batches and may appear in the playlist
+    in a different order than in the file; use --keep-order to preserve it.
+    """
+    logging.info(f"Starting to add videos from '{file}' to playlist '{playlist_id}'.")
 
-    logging.info("Successfully authenticated with YouTube API.")
+    # Parse the input file on a worker thread while authentication (local I/O, token
+    # refresh or the browser flow) and the playlist fetch run; they are independent of it.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        parsed_future = pool.submit(_extract_all_ids, file)
+        youtube = get_authenticated_service()
+        if not youtube:
+            click.echo("Failed to authenticate with YouTube API. Exiting.", err=True)
+            sys.exit(1)
 
-    # Verify playlist exists before proceeding
-    if not verify_playlist_exists(youtube, playlist_id):
-         # verify_playlist_exists already prints error messages
-         sys.exit(1)
+        logging.info("Successfully authenticated with YouTube API.")
 
-    # Fetch Existing Video IDs for Deduplication
-    existing_video_ids = get_existing_playlist_video_ids(youtube, playlist_id)
-    # Note: If get_existing_playlist_video_ids fails, it returns an empty set and logs errors.
+        # Fetch Existing Video IDs for Deduplication
+        # The first page of the fetch also verifies the playlist exists and is accessible.
+        existing_video_ids = get_existing_playlist_video_ids(youtube, playlist_id, use_cache=not refresh_cache)
+        if existing_video_ids is None:
+             # get_existing_playlist_video_ids already prints error messages
+             sys.exit(1)
+    existing_video_ids = frozenset(existing_video_ids) # Read-only from here on; new IDs go to seen_in_file
+    # Note: If get_existing_playlist_video_ids fails otherwise, it returns an empty set and logs errors.
     # The script will continue but won't deduplicate properly if the fetch failed.
     # Consider exiting if the fetch fails catastrophically based on requirements.
 
     added_count = 0
     skipped_count = 0
     duplicate_count = 0
+    unavailable_count = 0
     error_count = 0
-    line_num = 0
+    video_ids_to_add = []
+    seen_in_file = set() # IDs already queued from this file
+    warnings = [] # Written to stderr in one go after the loop
 
     try:
-        with open(file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                url = line.strip()
-                if not url or url.startswith("#"): # Skip empty lines and comments
-                    continue
-
-                video_id = extract_video_id(url)
-                if video_id:
-                    # Check for Duplicates
-                    if video_id in existing_video_ids:
-                        logging.info(f"Skipping duplicate video ID: {video_id} (already in playlist)")
-                        duplicate_count += 1
-                        continue # Move to the next line
-
-                    logging.info(f"Attempting to add video ID: {video_id} from URL: {url}")
-                    if add_video_to_playlist(youtube, playlist_id, video_id):
-                        added_count += 1
-                        # Add to set locally to prevent duplicates from *within the same file*
-                        # if the API call succeeds, even if initial fetch failed.
-                        existing_video_ids.add(video_id)
-                    else:
-                        # Error logging is handled within add_video_to_playlist
-                        error_count += 1
-                else:
-                    click.echo(f"Warning: Could not extract video ID from line {line_num}: '{url}'", err=True)
-                    skipped_count += 1
-
+        parsed_lines = parsed_future.result()
     except FileNotFoundError:
         logging.error(f"Input file not found: {file}")
         click.echo(f"Error: Input file not found: {file}", err=True)
@@ -89,11 +88,51 @@ def add(file: Path, playlist_id: str):
         click.echo(f"An unexpected error occurred processing the file: {e}", err=True)
         sys.exit(1)
 
+    for line_num, url, video_id in parsed_lines:
+        if video_id:
+            # Check for Duplicates
+            if video_id in existing_video_ids:
+                logging.debug(f"Skipping duplicate video ID: {video_id} (already in playlist)")
+                duplicate_count += 1
+                continue # Move to the next line
+            if video_id in seen_in_file:
+                logging.debug(f"Skipping duplicate video ID: {video_id} (listed earlier in the file)")
+                duplicate_count += 1
+                continue
+
+            logging.debug(f"Queueing video ID: {video_id} from URL: {url}")
+            video_ids_to_add.append(video_id)
+            seen_in_file.add(video_id)
+        else:
+            warnings.append(f"Warning: Could not extract video ID from line {line_num}: '{url}'")
+            skipped_count += 1
+
+    if warnings:
+        click.echo("\n".join(warnings), err=True)
+
+    # Drop deleted/private videos up front: a cheap read instead of a failed insert each
+    available_ids = get_available_video_ids(youtube, video_ids_to_add)
+    for video_id in video_ids_to_add:
+        if video_id not in available_ids:
+            logging.warning(f"Video ID '{video_id}' not found or private. Skipping.")
+            unavailable_count += 1
+    video_ids_to_add = [video_id for video_id in video_ids_to_add if video_id in available_ids]
+
+    # Insert the queued videos using batched requests (or one by one with --keep-order)
+    # Error logging is handled within add_videos_to_playlist
+    with click.progressbar(length=len(video_ids_to_add), label="Adding videos", file=sys.stderr) as progress_bar:
+        results = add_videos_to_playlist(youtube, playlist_id, video_ids_to_add,
+                                         on_progress=lambda video_id, added: progress_bar.update(1),
+                                         keep_order=keep_order)
+    added_count = sum(1 for added in results.values() if added)
+    error_count = len(video_ids_to_add) - added_count
+
     logging.info("Video adding process finished.")
     click.echo("\n--- Summary ---")
     click.echo(f"Successfully added: {added_count} videos.")
     click.echo(f"Skipped (invalid URL/ID): {skipped_count} lines.")
     click.echo(f"Skipped (duplicate): {duplicate_count} videos.")
+    click.echo(f"Skipped (unavailable/private): {unavailable_count} videos.")
     click.echo(f"Errors during addition: {error_count} videos.")
 
     # Provide hint if errors occurred and no videos were added
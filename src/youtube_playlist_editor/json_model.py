@@ -0,0 +1,34 @@
+import logging
+from typing import Optional
+
+from googleapiclient.model import JsonModel
+
+# orjson is an optional speedup (install the "fast-json" extra); fall back to the stdlib json model.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonModel(JsonModel):
+    """JsonModel that (de)serializes request and response bodies with orjson."""
+
+    def serialize(self, body_value):
+        if self._data_wrapper:
+            return super().serialize(body_value)
+        return orjson.dumps(body_value).decode("utf-8")
+
+    def deserialize(self, content):
+        if self._data_wrapper:
+            return super().deserialize(content)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Non-JSON bodies keep the stdlib model's handling (returned as text)
+            return super().deserialize(content)
+
+def get_json_model() -> Optional[JsonModel]:
+    """Returns an orjson-backed model if orjson is installed, else None (library default)."""
+    if orjson is None:
+        logging.debug("orjson not installed; using the default JSON model.")
+        return None
+    return OrjsonModel(data_wrapper=False)
@@ -1,24 +1,103 @@
-import re
+import os
+import mmap
+import stat
+import string
 import logging
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
 
 # --- URL Parsing ---
 
+# Video IDs are always 11 characters drawn from the URL-safe base64 alphabet.
+VIDEO_ID_LENGTH = 11
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+_SHORT_HOST = "youtu.be/"
+_LONG_HOST = "youtube.com/"
+_WATCH_PREFIX = "watch?"
+# Path prefixes after "youtube.com/" that are followed directly by the video ID
+_PATH_PREFIXES = ("embed/", "v/", "shorts/", "live/")
+
+def _slice_video_id(text: str, start: int) -> Optional[str]:
+    """Returns the 11-char video ID starting at `start` if every character is valid."""
+    candidate = text[start:start + VIDEO_ID_LENGTH]
+    if len(candidate) == VIDEO_ID_LENGTH and _ID_CHARS.issuperset(candidate):
+        return candidate
+    return None
+
+# URL lists often repeat the same links, so parse results are memoized (misses included).
+# The parser is pure; the miss warning stays in extract_video_id so it is logged every time.
+@lru_cache(maxsize=8192)
+def _parse_video_id(url: str) -> Optional[str]:
+    """Hand-written matcher for the supported URL shapes (no regex engine involved)."""
+    host_index = url.find(_SHORT_HOST)
+    if host_index != -1:
+        return _slice_video_id(url, host_index + len(_SHORT_HOST))
+
+    host_index = url.find(_LONG_HOST)
+    if host_index == -1:
+        return None
+    path_start = host_index + len(_LONG_HOST)
+
+    if url.startswith(_WATCH_PREFIX, path_start):
+        # The v= parameter is not always first (e.g. watch?feature=share&v=...)
+        for param in url[path_start + len(_WATCH_PREFIX):].split("&"):
+            if param.startswith("v="):
+                return _slice_video_id(param, 2)
+        return None
+
+    for prefix in _PATH_PREFIXES:
+        if url.startswith(prefix, path_start):
+            return _slice_video_id(url, path_start + len(prefix))
+    return None
+
 def extract_video_id(url: str) -> Optional[str]:
     """Extracts YouTube video ID from various URL formats."""
-    # Regex patterns to match YouTube video IDs
-    patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=([a-zA-Z0-9_-]{11})',        # Standard watch URL
-        r'(?:https?:\/\/)?(?:www\.)?youtu\.be\/([a-zA-Z0-9_-]{11})',                 # Shortened youtu.be URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([a-zA-Z0-9_-]{11})',       # Embed URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/v\/([a-zA-Z0-9_-]{11})',           # v/ URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})',     # Shorts URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/live\/([a-zA-Z0-9_-]{11})'         # Live URL
-        # Add more patterns if needed
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    video_id = _parse_video_id(url)
+    if video_id:
+        return video_id
     logging.warning(f"Could not extract video ID from URL: {url}")
-    return None 
\ No newline at end of file
+    return None
+
+# --- Input File Parsing ---
+
+def _iter_kept_lines(lines: Iterator[bytes]) -> Iterator[tuple[int, str]]:
+    """Numbers raw byte lines, drops blank lines and comments, and decodes the rest."""
+    for line_num, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        if not line or line.startswith(b"#"): # Skip empty lines and comments
+            continue
+        yield line_num, line.decode('utf-8', 'replace')
+
+def _iter_mapped_lines(mm: mmap.mmap) -> Iterator[bytes]:
+    """Splits a memory-mapped file on newlines with mmap.find."""
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        newline = mm.find(b'\n', pos)
+        end = newline if newline != -1 else size
+        yield mm[pos:end]
+        pos = end + 1
+
+def iter_url_lines(path: Path) -> Iterator[tuple[int, str]]:
+    """Yields (line number, stripped line) for each non-empty, non-comment line of a URL file.
+
+    Regular files are memory-mapped and split on newlines with mmap.find. Pipes, FIFOs
+    (e.g. `-f <(grep ...)`, /dev/stdin) and files that cannot be mapped are read with a
+    plain buffered line loop instead.
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if stat.S_ISREG(st.st_mode) and st.st_size > 0: # mmap cannot map empty or non-regular files
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                logging.debug(f"Could not memory-map '{path}' ({e}); reading it line by line.")
+            else:
+                with mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"): # Not available on Windows
+                        mm.madvise(mmap.MADV_SEQUENTIAL) # Ask for aggressive readahead on cold, large files
+                    yield from _iter_kept_lines(_iter_mapped_lines(mm))
+                return
+        yield from _iter_kept_lines(f)
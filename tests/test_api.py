@@ -1,50 +1,73 @@
 # Placeholder for api tests 
 
 import pytest
+import logging
 import time
-from unittest.mock import MagicMock, call
+import json
+from typing import Optional
+from unittest.mock import MagicMock, Mock, call
+
+import httplib2
 from googleapiclient.errors import HttpError
 
 # Import functions to test
 from youtube_playlist_editor.api import (
     get_existing_playlist_video_ids,
     add_video_to_playlist,
-    verify_playlist_exists,
+    add_videos_to_playlist,
+    get_available_video_ids,
+    _new_authorized_http,
+    QuotaExceededError,
+    QUOTA_EXCEEDED_MESSAGE,
     MAX_RETRIES,
-    INITIAL_BACKOFF
+    INITIAL_BACKOFF,
+    BATCH_SIZE,
+    MAX_BATCH_WORKERS,
+    PLAYLIST_STATE_FIELDS,
+    PLAYLIST_MEMBERSHIP_FIELDS,
+    VIDEO_IDS_FIELDS,
+    REQUEST_MAX_TRIES,
+    REQUEST_BASE_BACKOFF
 )
 
 # --- Mocks and Fixtures ---
 
+@pytest.fixture(autouse=True)
+def playlist_cache_dir(tmp_path, monkeypatch):
+    """Keeps the playlist cache inside a per-test temporary directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr("youtube_playlist_editor.api.CACHE_DIR", cache_dir)
+    return cache_dir
+
 @pytest.fixture
-def mock_youtube_resource(mocker):
+def mock_youtube_resource(mocker, caplog):
     """Fixture to create a mock googleapiclient.discovery.Resource object."""
-    mock_resource = MagicMock()
+    # Plain Mock: the resource chain needs no magic methods, and Mock is much cheaper to build
+    mock_resource = Mock()
 
     # Mock the chainable methods and execute()
-    mock_playlistItems = MagicMock()
+    mock_playlistItems = Mock()
     mock_resource.playlistItems.return_value = mock_playlistItems
-    mock_playlistItems_list = MagicMock()
+    mock_playlistItems_list = Mock()
     mock_playlistItems.list.return_value = mock_playlistItems_list
-    mock_playlistItems_list.execute = MagicMock()
+    mock_playlistItems_list.execute = Mock()
 
-    mock_playlistItems_insert = MagicMock()
+    mock_playlistItems_insert = Mock()
     mock_playlistItems.insert.return_value = mock_playlistItems_insert
-    mock_playlistItems_insert.execute = MagicMock()
+    mock_playlistItems_insert.execute = Mock()
 
-    mock_playlists = MagicMock()
+    mock_playlists = Mock()
     mock_resource.playlists.return_value = mock_playlists
-    mock_playlists_list = MagicMock()
+    mock_playlists_list = Mock()
     mock_playlists.list.return_value = mock_playlists_list
-    mock_playlists_list.execute = MagicMock()
+    mock_playlists_list.execute = Mock()
+    mock_playlists_list.execute.return_value = {"items": []} # No playlist state -> cache bypassed
 
     # Mock time.sleep used in retry logic
     mock_sleep = mocker.patch("time.sleep")
 
-    # Mock logging and click
-    mock_log_info = mocker.patch("logging.info")
-    mock_log_warning = mocker.patch("logging.warning")
-    mock_log_error = mocker.patch("logging.error")
+    # Capture log records (asserted via caplog) and mock click
+    caplog.set_level(logging.DEBUG)
     mock_click_echo = mocker.patch("click.echo")
 
     # Return the main resource mock and mocks for chained methods/functions
@@ -54,106 +77,34 @@ def mock_youtube_resource(mocker):
         "playlistItems_insert_execute": mock_playlistItems_insert.execute,
         "playlists_list_execute": mock_playlists_list.execute,
         "sleep": mock_sleep,
-        "log_info": mock_log_info,
-        "log_warning": mock_log_warning,
-        "log_error": mock_log_error,
         "click_echo": mock_click_echo
     }
 
 
-def create_http_error(status_code: int, content: bytes = b'') -> HttpError:
+def create_http_error(status_code: int, content: bytes = b'', headers: Optional[dict] = None) -> HttpError:
     """Helper to create HttpError instances for testing."""
-    mock_resp = MagicMock()
-    mock_resp.status = status_code
+    # A real httplib2.Response so header lookups (e.g. Retry-After) behave like the API's
+    resp = httplib2.Response({"status": status_code, **(headers or {})})
     # The HttpError constructor expects response, content, and uri
-    return HttpError(resp=mock_resp, content=content, uri='http://example.com')
-
-# --- Tests for verify_playlist_exists ---
-
-def test_verify_playlist_exists_success(mock_youtube_resource):
-    """Test verify_playlist_exists successfully finds the playlist."""
-    mock_youtube_resource["playlists_list_execute"].return_value = {"items": [{"id": "PL_test"}]}
-    playlist_id = "PL_test"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
+    return HttpError(resp=resp, content=content, uri='http://example.com')
 
-    assert result is True
-    mock_youtube_resource["youtube"].playlists().list.assert_called_once_with(
-        part="id", id=playlist_id, maxResults=1
-    )
-    mock_youtube_resource["playlists_list_execute"].assert_called_once()
-    mock_youtube_resource["log_info"].assert_any_call(f"Playlist ID '{playlist_id}' is valid and accessible.")
-    mock_youtube_resource["click_echo"].assert_not_called()
-
-def test_verify_playlist_exists_not_found_empty_items(mock_youtube_resource):
-    """Test verify_playlist_exists when API returns empty items list."""
-    mock_youtube_resource["playlists_list_execute"].return_value = {"items": []}
-    playlist_id = "PL_not_exist"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
-
-    assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"Playlist ID '{playlist_id}' not found or user does not have access.")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' not found or you do not have access to it.", err=True)
-
-def test_verify_playlist_exists_http_404(mock_youtube_resource):
-    """Test verify_playlist_exists handles 404 HttpError."""
-    error_404 = create_http_error(404)
-    mock_youtube_resource["playlists_list_execute"].side_effect = error_404
-    playlist_id = "PL_404"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
-
-    assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"API Error verifying playlist ID '{playlist_id}': {error_404}")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' was not found. Please check the ID.", err=True)
-
-def test_verify_playlist_exists_http_403(mock_youtube_resource):
-    """Test verify_playlist_exists handles 403 HttpError."""
-    error_403 = create_http_error(403)
-    mock_youtube_resource["playlists_list_execute"].side_effect = error_403
-    playlist_id = "PL_403"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
-
-    assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"API Error verifying playlist ID '{playlist_id}': {error_403}")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Permission denied when trying to access playlist '{playlist_id}'. Check API key/OAuth scopes or playlist permissions.", err=True)
-
-def test_verify_playlist_exists_other_http_error(mock_youtube_resource):
-    """Test verify_playlist_exists handles other HttpErrors."""
-    error_500 = create_http_error(500)
-    mock_youtube_resource["playlists_list_execute"].side_effect = error_500
-    playlist_id = "PL_500"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
-
-    assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"API Error verifying playlist ID '{playlist_id}': {error_500}")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: An API error occurred while verifying playlist ID '{playlist_id}': {error_500}", err=True)
-
-def test_verify_playlist_exists_unexpected_error(mock_youtube_resource):
-    """Test verify_playlist_exists handles unexpected non-HTTP errors."""
-    error_unexpected = Exception("Something broke")
-    mock_youtube_resource["playlists_list_execute"].side_effect = error_unexpected
-    playlist_id = "PL_broken"
-
-    result = verify_playlist_exists(mock_youtube_resource["youtube"], playlist_id)
-
-    assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"An unexpected error occurred verifying playlist ID '{playlist_id}': {error_unexpected}")
-    mock_youtube_resource["click_echo"].assert_any_call(f"An unexpected error occurred while verifying playlist ID: {error_unexpected}", err=True)
+def assert_logged(caplog, level: int, message: str) -> None:
+    """Asserts that `message` was logged at exactly `level` (via the module-level logging functions)."""
+    assert ("root", level, message) in caplog.record_tuples, f"{logging.getLevelName(level)} not logged: {message}"
 
+def count_logged(caplog, level: int) -> int:
+    """Returns how many records were logged at exactly `level`."""
+    return sum(1 for record in caplog.records if record.levelno == level)
 
 # --- Tests for get_existing_playlist_video_ids ---
 
-def test_get_existing_ids_success_no_pagination(mock_youtube_resource):
+def test_get_existing_ids_success_no_pagination(mock_youtube_resource, caplog):
     """Test fetching existing IDs successfully with no pagination needed."""
     playlist_id = "PL_test"
     mock_youtube_resource["playlistItems_list_execute"].return_value = {
         "items": [
-            {"snippet": {"resourceId": {"videoId": "vid1"}}},
-            {"snippet": {"resourceId": {"videoId": "vid2"}}}
+            {"contentDetails": {"videoId": "vid1"}},
+            {"contentDetails": {"videoId": "vid2"}}
         ]
         # No nextPageToken means end of list
     }
@@ -162,21 +113,22 @@ def test_get_existing_ids_success_no_pagination(mock_youtube_resource):
 
     assert result == {"vid1", "vid2"}
     mock_youtube_resource["youtube"].playlistItems().list.assert_called_once_with(
-        part="snippet", playlistId=playlist_id, maxResults=50, pageToken=None
+        part="contentDetails", playlistId=playlist_id, maxResults=50, pageToken=None,
+        fields="items(contentDetails/videoId),nextPageToken"
     )
     mock_youtube_resource["playlistItems_list_execute"].assert_called_once()
-    mock_youtube_resource["log_info"].assert_any_call(f"Found {len(result)} existing video IDs in the playlist.")
+    assert_logged(caplog, logging.INFO, f"Found {len(result)} existing video IDs in the playlist.")
 
-def test_get_existing_ids_success_with_pagination(mock_youtube_resource):
+def test_get_existing_ids_success_with_pagination(mock_youtube_resource, caplog):
     """Test fetching existing IDs successfully across multiple pages."""
     playlist_id = "PL_paged"
     mock_youtube_resource["playlistItems_list_execute"].side_effect = [
         {
-            "items": [{"snippet": {"resourceId": {"videoId": "vid1"}}}],
+            "items": [{"contentDetails": {"videoId": "vid1"}}],
             "nextPageToken": "page2"
         },
         {
-            "items": [{"snippet": {"resourceId": {"videoId": "vid2"}}}],
+            "items": [{"contentDetails": {"videoId": "vid2"}}],
             # No nextPageToken on the second response
         }
     ]
@@ -188,18 +140,19 @@ def test_get_existing_ids_success_with_pagination(mock_youtube_resource):
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == 2
     # Check the arguments passed to the list method (optional)
     # expected_list_calls = [
-    #     call(part="snippet", playlistId=playlist_id, maxResults=50, pageToken=None),
-    #     call(part="snippet", playlistId=playlist_id, maxResults=50, pageToken="page2")
+    #     call(part="contentDetails", playlistId=playlist_id, maxResults=50, pageToken=None, fields=PLAYLIST_ITEMS_FIELDS),
+    #     call(part="contentDetails", playlistId=playlist_id, maxResults=50, pageToken="page2", fields=PLAYLIST_ITEMS_FIELDS)
     # ]
     # mock_youtube_resource["youtube"].playlistItems().list.assert_has_calls(expected_list_calls)
 
-    mock_youtube_resource["log_info"].assert_any_call(f"Found {len(result)} existing video IDs in the playlist.")
+    assert_logged(caplog, logging.INFO, f"Found {len(result)} existing video IDs in the playlist.")
 
-def test_get_existing_ids_http_500_retry_success(mock_youtube_resource):
+def test_get_existing_ids_http_500_retry_success(mock_youtube_resource, mocker, caplog):
     """Test retry logic on 500 error, succeeding on the second attempt."""
+    mocker.patch("youtube_playlist_editor.api.random.uniform", return_value=0.1)
     playlist_id = "PL_retry"
     error_500 = create_http_error(500)
-    success_response = {"items": [{"snippet": {"resourceId": {"videoId": "vid1"}}}]}
+    success_response = {"items": [{"contentDetails": {"videoId": "vid1"}}]}
 
     mock_youtube_resource["playlistItems_list_execute"].side_effect = [error_500, success_response]
 
@@ -207,26 +160,76 @@ def test_get_existing_ids_http_500_retry_success(mock_youtube_resource):
 
     assert result == {"vid1"}
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == 2
-    mock_youtube_resource["log_warning"].assert_any_call(f"Attempt 1/{MAX_RETRIES}: API Error fetching existing playlist items: {error_500}. Retrying in {INITIAL_BACKOFF}s...")
-    mock_youtube_resource["sleep"].assert_called_once_with(INITIAL_BACKOFF)
-    mock_youtube_resource["log_info"].assert_any_call(f"Found {len(result)} existing video IDs in the playlist.")
+    assert_logged(caplog, logging.WARNING, f"Attempt 1/{MAX_RETRIES}: API Error fetching existing playlist items: {error_500}. Retrying in {INITIAL_BACKOFF + 0.1:.2f}s...")
+    mock_youtube_resource["sleep"].assert_called_once_with(INITIAL_BACKOFF + 0.1)
+    assert_logged(caplog, logging.INFO, f"Found {len(result)} existing video IDs in the playlist.")
+
+def test_get_existing_ids_http_429_honors_retry_after(mock_youtube_resource):
+    """Test that a rate-limited page fetch waits for the server's Retry-After before retrying."""
+    error_429 = create_http_error(429, headers={"retry-after": "7"})
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = [error_429, {"items": []}]
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], "PL_rate_limited")
 
-def test_get_existing_ids_http_404_no_retry(mock_youtube_resource):
-    """Test that 404 error during fetch is not retried and returns empty set."""
+    assert result == set()
+    mock_youtube_resource["sleep"].assert_called_once_with(7.0)
+
+def test_get_existing_ids_http_404_no_retry(mock_youtube_resource, mocker, caplog):
+    """Test that 404 error during fetch is not retried and reports the playlist as missing (None)."""
+    mocker.patch("youtube_playlist_editor.api.random.uniform", return_value=0.1)
     playlist_id = "PL_vanished"
     error_404 = create_http_error(404)
     mock_youtube_resource["playlistItems_list_execute"].side_effect = error_404
 
     result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
 
-    assert result == set()
+    assert result is None
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == 1
-    mock_youtube_resource["log_warning"].assert_any_call(f"Attempt 1/{MAX_RETRIES}: API Error fetching existing playlist items: {error_404}. Retrying in {INITIAL_BACKOFF}s...")
-    mock_youtube_resource["log_error"].assert_any_call(f"Playlist '{playlist_id}' not found while fetching existing items.")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' seems to have become inaccessible after the initial check.", err=True)
+    assert_logged(caplog, logging.WARNING, f"Attempt 1/{MAX_RETRIES}: API Error fetching existing playlist items: {error_404}. Retrying in {INITIAL_BACKOFF + 0.1:.2f}s...")
+    assert_logged(caplog, logging.ERROR, f"Playlist '{playlist_id}' not found or not accessible while fetching existing items.")
+    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' not found or you do not have access to it.", err=True)
+    mock_youtube_resource["sleep"].assert_not_called()
+
+def test_get_existing_ids_http_403_first_page_not_accessible(mock_youtube_resource):
+    """Test that a 403 on the first page reports the playlist as inaccessible (None)."""
+    playlist_id = "PL_private"
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = create_http_error(403)
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
+
+    assert result is None
+    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' not found or you do not have access to it.", err=True)
+    mock_youtube_resource["sleep"].assert_not_called()
+
+QUOTA_EXCEEDED_BODY = b'{"error": {"code": 403, "message": "Quota exceeded.", "errors": [{"reason": "quotaExceeded"}]}}'
+RATE_LIMIT_EXCEEDED_BODY = b'{"error": {"code": 403, "message": "Rate limit exceeded.", "errors": [{"reason": "rateLimitExceeded"}]}}'
+
+def test_get_existing_ids_http_403_quota_exceeded(mock_youtube_resource, caplog):
+    """Test that an exhausted quota is reported as such, not as an inaccessible playlist."""
+    playlist_id = "PL_quota"
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = create_http_error(403, QUOTA_EXCEEDED_BODY)
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
+
+    assert result is None
+    assert_logged(caplog, logging.ERROR, f"YouTube API quota exceeded while fetching existing items of playlist '{playlist_id}'.")
+    mock_youtube_resource["click_echo"].assert_called_once_with("Error: The YouTube Data API daily quota has been exceeded. Try again after it resets (midnight Pacific Time).", err=True)
     mock_youtube_resource["sleep"].assert_not_called()
 
-def test_get_existing_ids_max_retries_fail(mock_youtube_resource):
+def test_get_existing_ids_http_403_rate_limit_retried(mock_youtube_resource):
+    """Test that a 403 rateLimitExceeded on the first page is retried like a 429."""
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = [
+        create_http_error(403, RATE_LIMIT_EXCEEDED_BODY),
+        {"items": [{"contentDetails": {"videoId": "vid1"}}]},
+    ]
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], "PL_rate_limited")
+
+    assert result == {"vid1"}
+    mock_youtube_resource["sleep"].assert_called_once()
+    mock_youtube_resource["click_echo"].assert_not_called()
+
+def test_get_existing_ids_max_retries_fail(mock_youtube_resource, caplog):
     """Test that fetching fails after MAX_RETRIES attempts on 503 errors."""
     playlist_id = "PL_persistent_fail"
     error_503 = create_http_error(503)
@@ -237,24 +240,24 @@ def test_get_existing_ids_max_retries_fail(mock_youtube_resource):
     assert result == set()
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == MAX_RETRIES
     assert mock_youtube_resource["sleep"].call_count == MAX_RETRIES -1 # Sleeps between retries
-    mock_youtube_resource["log_error"].assert_any_call(f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to API server errors.")
+    assert_logged(caplog, logging.ERROR, f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to API server errors.")
     mock_youtube_resource["click_echo"].assert_any_call(f"Error: Failed to retrieve existing videos from playlist '{playlist_id}' due to API server errors.", err=True)
 
-def test_get_existing_ids_non_retryable_http_error(mock_youtube_resource):
-    """Test fetching fails immediately on non-retryable HTTP error (e.g., 403)."""
-    playlist_id = "PL_forbidden"
-    error_403 = create_http_error(403)
-    mock_youtube_resource["playlistItems_list_execute"].side_effect = error_403
+def test_get_existing_ids_non_retryable_http_error(mock_youtube_resource, caplog):
+    """Test fetching fails immediately on non-retryable HTTP error (e.g., 400)."""
+    playlist_id = "PL_bad_request"
+    error_400 = create_http_error(400)
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = error_400
 
     result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
 
     assert result == set()
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == 1
-    mock_youtube_resource["log_error"].assert_any_call(f"Failed to fetch existing playlist items after 1 attempts due to non-retryable error: {error_403}")
+    assert_logged(caplog, logging.ERROR, f"Failed to fetch existing playlist items after 1 attempts due to non-retryable error: {error_400}")
     mock_youtube_resource["click_echo"].assert_any_call(f"Error: An API error occurred retrieving existing videos from playlist '{playlist_id}'.", err=True)
     mock_youtube_resource["sleep"].assert_not_called()
 
-def test_get_existing_ids_unexpected_error_retry_fail(mock_youtube_resource):
+def test_get_existing_ids_unexpected_error_retry_fail(mock_youtube_resource, caplog):
     """Test retry logic fails on unexpected errors after max attempts."""
     playlist_id = "PL_unexpected"
     unexpected_error = Exception("Something else broke")
@@ -265,12 +268,118 @@ def test_get_existing_ids_unexpected_error_retry_fail(mock_youtube_resource):
     assert result == set()
     assert mock_youtube_resource["playlistItems_list_execute"].call_count == MAX_RETRIES
     assert mock_youtube_resource["sleep"].call_count == MAX_RETRIES -1
-    mock_youtube_resource["log_error"].assert_any_call(f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to unexpected error: {unexpected_error}")
+    assert_logged(caplog, logging.ERROR, f"Failed to fetch existing playlist items after {MAX_RETRIES} attempts due to unexpected error: {unexpected_error}")
     mock_youtube_resource["click_echo"].assert_any_call(f"Error: An unexpected error occurred retrieving existing videos from playlist '{playlist_id}'.", err=True)
 
+def test_get_existing_ids_uses_cache_when_playlist_unchanged(mock_youtube_resource, playlist_cache_dir):
+    """Test that cached IDs are returned without pagination when etag and itemCount match."""
+    playlist_id = "PL_cached"
+    playlist_cache_dir.mkdir()
+    (playlist_cache_dir / f"{playlist_id}.json").write_text(
+        json.dumps({"etag": "etag1", "item_count": 2, "video_ids": ["vid1", "vid2"]})
+    )
+    mock_youtube_resource["playlists_list_execute"].return_value = {
+        "items": [{"etag": "etag1", "contentDetails": {"itemCount": 2}}]
+    }
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
+
+    assert result == {"vid1", "vid2"}
+    mock_youtube_resource["youtube"].playlists().list.assert_called_once_with(
+        part="contentDetails", id=playlist_id, fields=PLAYLIST_STATE_FIELDS
+    )
+    mock_youtube_resource["playlistItems_list_execute"].assert_not_called()
+
+def test_get_existing_ids_refetches_and_rewrites_stale_cache(mock_youtube_resource, playlist_cache_dir):
+    """Test that a changed playlist is re-fetched and the cache is rewritten."""
+    playlist_id = "PL_stale"
+    playlist_cache_dir.mkdir()
+    cache_file = playlist_cache_dir / f"{playlist_id}.json"
+    cache_file.write_text(json.dumps({"etag": "old", "item_count": 1, "video_ids": ["vid1"]}))
+    mock_youtube_resource["playlists_list_execute"].return_value = {
+        "items": [{"etag": "new", "contentDetails": {"itemCount": 2}}]
+    }
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {
+        "items": [{"contentDetails": {"videoId": "vid1"}}, {"contentDetails": {"videoId": "vid2"}}]
+    }
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
+
+    assert result == {"vid1", "vid2"}
+    mock_youtube_resource["playlistItems_list_execute"].assert_called_once()
+    assert json.loads(cache_file.read_text()) == {"etag": "new", "item_count": 2, "video_ids": ["vid1", "vid2"]}
+
+def test_get_existing_ids_refresh_ignores_cache(mock_youtube_resource, playlist_cache_dir):
+    """Test that use_cache=False re-reads an unchanged playlist and rewrites the cache."""
+    playlist_id = "PL_refresh"
+    playlist_cache_dir.mkdir()
+    cache_file = playlist_cache_dir / f"{playlist_id}.json"
+    cache_file.write_text(json.dumps({"etag": "etag1", "item_count": 1, "video_ids": ["stale"]}))
+    mock_youtube_resource["playlists_list_execute"].return_value = {
+        "items": [{"etag": "etag1", "contentDetails": {"itemCount": 1}}]
+    }
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {
+        "items": [{"contentDetails": {"videoId": "vid1"}}]
+    }
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id, use_cache=False)
+
+    assert result == {"vid1"}
+    assert json.loads(cache_file.read_text())["video_ids"] == ["vid1"]
+
+def test_get_existing_ids_empty_playlist_skips_pagination(mock_youtube_resource):
+    """Test that a playlist reporting zero items is not paginated."""
+    mock_youtube_resource["playlists_list_execute"].return_value = {
+        "items": [{"etag": "etag0", "contentDetails": {"itemCount": 0}}]
+    }
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], "PL_empty_state")
+
+    assert result == set()
+    mock_youtube_resource["playlistItems_list_execute"].assert_not_called()
+
+def test_get_existing_ids_failed_fetch_not_cached(mock_youtube_resource, playlist_cache_dir):
+    """Test that a failed fetch does not write an (empty) cache entry."""
+    playlist_id = "PL_fail_cache"
+    mock_youtube_resource["playlists_list_execute"].return_value = {
+        "items": [{"etag": "etag1", "contentDetails": {"itemCount": 5}}]
+    }
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = create_http_error(400)
+
+    result = get_existing_playlist_video_ids(mock_youtube_resource["youtube"], playlist_id)
+
+    assert result == set()
+    assert not (playlist_cache_dir / f"{playlist_id}.json").exists()
+
+# --- Tests for get_available_video_ids ---
+
+def test_get_available_video_ids_chunks_and_drops_missing(mock_youtube_resource):
+    """Test that IDs are checked BATCH_SIZE at a time and missing ones are left out."""
+    video_ids = [f"vid{i}" for i in range(BATCH_SIZE + 1)]
+    videos_list = mock_youtube_resource["youtube"].videos().list
+    videos_list.return_value.execute.side_effect = [
+        {"items": [{"id": vid} for vid in video_ids[1:BATCH_SIZE]]}, # vid0 is private/deleted
+        {"items": [{"id": video_ids[BATCH_SIZE]}]},
+    ]
+
+    result = get_available_video_ids(mock_youtube_resource["youtube"], video_ids)
+
+    assert result == set(video_ids[1:])
+    videos_list.assert_any_call(part="id", id=",".join(video_ids[:BATCH_SIZE]), fields=VIDEO_IDS_FIELDS)
+    videos_list.assert_any_call(part="id", id=video_ids[BATCH_SIZE], fields=VIDEO_IDS_FIELDS)
+
+def test_get_available_video_ids_failed_check_assumes_available(mock_youtube_resource, caplog):
+    """Test that a failed availability check does not drop any videos."""
+    mock_youtube_resource["youtube"].videos().list.return_value.execute.side_effect = create_http_error(400)
+
+    result = get_available_video_ids(mock_youtube_resource["youtube"], ["vid1", "vid2"])
+
+    assert result == {"vid1", "vid2"}
+    assert count_logged(caplog, logging.WARNING) == 1
+
 # --- Tests for add_video_to_playlist ---
 
-def test_add_video_success(mock_youtube_resource):
+def test_add_video_success(mock_youtube_resource, caplog):
     """Test successfully adding a video."""
     playlist_id = "PL_add_test"
     video_id = "vid_add"
@@ -293,76 +402,183 @@ def test_add_video_success(mock_youtube_resource):
         }
     )
     mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
-    mock_youtube_resource["log_info"].assert_any_call(f"Successfully added video ID '{video_id}' to playlist '{playlist_id}'. Response: {mock_response.get('id')}")
+    assert_logged(caplog, logging.DEBUG, f"Successfully added video ID '{video_id}' to playlist '{playlist_id}'. Response: {mock_response.get('id')}")
     mock_youtube_resource["click_echo"].assert_not_called()
 
-def test_add_video_http_404_playlist_not_found(mock_youtube_resource):
-    """Test add_video handles 404 error indicating playlist not found."""
-    playlist_id = "PL_add_404_pl"
-    video_id = "vid_add_404"
-    error_404_playlist = create_http_error(404, b'{"error": {"errors": [{"reason": "playlistNotFound"}]}}')
-    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_404_playlist
+PLAYLIST_NOT_FOUND_BODY = b'{"error": {"code": 404, "message": "Playlist not found.", "errors": [{"reason": "playlistNotFound"}]}}'
+VIDEO_NOT_FOUND_BODY = b'{"error": {"code": 404, "message": "Video not found.", "errors": [{"reason": "videoNotFound"}]}}'
+# googleapiclient fills error_details from "details" when present, hiding the "errors" reasons
+PLAYLIST_NOT_FOUND_WITH_DETAILS_BODY = (
+    b'{"error": {"code": 404, "message": "Playlist not found.", "errors": [{"reason": "playlistNotFound"}],'
+    b' "details": [{"@type": "type.googleapis.com/google.rpc.ErrorInfo", "reason": "PLAYLIST_NOT_FOUND"}]}}'
+)
+
+@pytest.mark.parametrize("status, content, log_level, expected_log, expected_echo", [
+    (404, PLAYLIST_NOT_FOUND_BODY, logging.ERROR,
+     "Playlist '{playlist_id}' not found when trying to add video '{video_id}'.",
+     "Error: Playlist ID '{playlist_id}' was not found. Please check the ID."),
+    (404, PLAYLIST_NOT_FOUND_WITH_DETAILS_BODY, logging.ERROR,
+     "Playlist '{playlist_id}' not found when trying to add video '{video_id}'.",
+     "Error: Playlist ID '{playlist_id}' was not found. Please check the ID."),
+    (404, VIDEO_NOT_FOUND_BODY, logging.WARNING, # Skippable video: no user-facing error
+     "Video ID '{video_id}' not found or private. Skipping.", None),
+    (404, b'Some error content mentioning videoNotFound', logging.ERROR, # Not JSON: generic 404 message
+     "API Error (404) adding video '{video_id}': {error}", None),
+    (403, b'', logging.ERROR,
+     "Permission denied (403) adding video '{video_id}'. Check API key/OAuth scopes, quota, or video/playlist permissions: {error}",
+     "Error: Permission denied when adding video '{video_id}'. Check API/OAuth setup or playlist settings."),
+    (409, b'', logging.WARNING, # Conflict is treated as skippable/non-fatal
+     "Video ID '{video_id}' might already be in the playlist '{playlist_id}' (API reported 409 Conflict). Skipping.", None),
+], ids=["404_playlist_not_found", "404_playlist_not_found_with_details", "404_video_not_found", "404_unparsed_body", "403_permission_denied", "409_conflict"])
+def test_add_video_http_errors(mock_youtube_resource, caplog, status, content, log_level, expected_log, expected_echo):
+    """Test add_video reports non-retryable HTTP errors without retrying."""
+    playlist_id = f"PL_add_{status}"
+    video_id = f"vid_add_{status}"
+    error = create_http_error(status, content)
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error
 
     result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
 
     assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"Playlist '{playlist_id}' not found when trying to add video '{video_id}'.")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Playlist ID '{playlist_id}' was not found. Please check the ID.", err=True)
-
-def test_add_video_http_404_video_not_found(mock_youtube_resource):
-    """Test add_video handles 404 error indicating video not found/private."""
-    playlist_id = "PL_add_404_vid"
-    video_id = "vid_private"
-    # Note: The error content might vary, checking for 'videoNotFound' is key
-    error_404_video = create_http_error(404, b'Some error content mentioning videoNotFound')
-    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_404_video
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
+    assert_logged(caplog, log_level, expected_log.format(playlist_id=playlist_id, video_id=video_id, error=error))
+    if log_level == logging.ERROR:
+        assert count_logged(caplog, logging.WARNING) == 0 # e.g. an unparsed body is not mistaken for videoNotFound
+    if expected_echo:
+        mock_youtube_resource["click_echo"].assert_any_call(expected_echo.format(playlist_id=playlist_id, video_id=video_id), err=True)
+    else:
+        mock_youtube_resource["click_echo"].assert_not_called()
+
+def test_add_video_http_500_server_error(mock_youtube_resource, caplog):
+    """Test add_video handles persistent 5xx server errors (non-fatal warning) after retrying."""
+    playlist_id = "PL_add_500"
+    video_id = "vid_add_500"
+    error_500 = create_http_error(500)
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_500
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": []}
 
     result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
 
     assert result is False
-    mock_youtube_resource["log_warning"].assert_any_call(f"Video ID '{video_id}' not found or private. Skipping.")
-    mock_youtube_resource["click_echo"].assert_not_called() # Should not show user error for skippable video
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == REQUEST_MAX_TRIES
+    # A 500 may have been applied, so every re-send is preceded by a membership check
+    assert mock_youtube_resource["playlistItems_list_execute"].call_count == REQUEST_MAX_TRIES
+    assert mock_youtube_resource["sleep"].call_count == REQUEST_MAX_TRIES - 1
+    assert_logged(caplog, logging.WARNING, f"API Server Error ({error_500.resp.status}) occurred adding video '{video_id}': {error_500}. This might resolve on its own later.")
+    mock_youtube_resource["click_echo"].assert_not_called()
 
-def test_add_video_http_403_permission_denied(mock_youtube_resource):
-    """Test add_video handles 403 permission denied error."""
-    playlist_id = "PL_add_403"
-    video_id = "vid_add_403"
-    error_403 = create_http_error(403)
-    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_403
+def test_add_video_retries_transient_error_then_succeeds(mocker, mock_youtube_resource):
+    """Test add_video retries a 503 with exponential backoff plus jitter and then succeeds."""
+    mocker.patch("youtube_playlist_editor.api.random.uniform", return_value=0.1)
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = [create_http_error(503), {"id": "item_1"}]
 
-    result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_retry_add", "vid_retry")
+
+    assert result is True
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == 2
+    mock_youtube_resource["sleep"].assert_called_once_with(REQUEST_BASE_BACKOFF + 0.1)
+
+def test_add_video_http_502_after_insert_applied_is_not_resent(mock_youtube_resource, caplog):
+    """Test add_video does not re-send an insert that failed with 502 but was applied."""
+    error_502 = create_http_error(502)
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_502
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": [{"id": "item_1"}]}
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_502", "vid_502")
+
+    assert result is True
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
+    mock_youtube_resource["sleep"].assert_not_called()
+    assert_logged(caplog, logging.INFO, f"Video ID 'vid_502' is in playlist 'PL_502' despite the error ({error_502!r}). Not re-adding it.")
+
+def test_add_video_honors_retry_after_on_429(mock_youtube_resource):
+    """Test add_video waits for the server's Retry-After on a 429 before retrying."""
+    error_429 = create_http_error(429, headers={"retry-after": "7"})
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = [error_429, {"id": "item_1"}]
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_429", "vid_429")
+
+    assert result is True
+    mock_youtube_resource["sleep"].assert_called_once_with(7.0)
+
+def test_add_video_network_timeout_retries_when_not_in_playlist(mocker, mock_youtube_resource):
+    """Test add_video re-sends a timed-out insert with backoff only after confirming the video is missing."""
+    mocker.patch("youtube_playlist_editor.api.random.uniform", return_value=0.1)
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = [TimeoutError("timed out"), {"id": "item_1"}]
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": []}
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_timeout", "vid_timeout")
+
+    assert result is True
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == 2
+    mock_youtube_resource["youtube"].playlistItems().list.assert_called_once_with(
+        part="id", playlistId="PL_timeout", videoId="vid_timeout", maxResults=1, fields=PLAYLIST_MEMBERSHIP_FIELDS
+    )
+    mock_youtube_resource["sleep"].assert_called_once_with(REQUEST_BASE_BACKOFF + 0.1)
+
+def test_add_video_network_timeout_after_insert_applied_is_not_resent(mock_youtube_resource, caplog):
+    """Test add_video does not re-send an insert whose response was lost but which was applied."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = TimeoutError("timed out")
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": [{"id": "item_1"}]}
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_timeout", "vid_timeout")
+
+    assert result is True
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
+    mock_youtube_resource["sleep"].assert_not_called()
+    assert_logged(caplog, logging.INFO, "Video ID 'vid_timeout' is in playlist 'PL_timeout' despite the error (TimeoutError('timed out')). Not re-adding it.")
+
+def test_add_video_network_error_not_resent_when_check_fails(mock_youtube_resource):
+    """Test add_video gives up rather than risk a duplicate when playlist membership cannot be checked."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = ConnectionResetError("reset")
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = Exception("check failed")
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_reset", "vid_reset")
 
     assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"Permission denied (403) adding video '{video_id}'. Check API key/OAuth scopes, quota, or video/playlist permissions: {error_403}")
-    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Permission denied when adding video '{video_id}'. Check API/OAuth setup or playlist settings.", err=True)
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
 
-def test_add_video_http_409_conflict(mock_youtube_resource):
-    """Test add_video handles 409 conflict (e.g., video already exists)."""
-    playlist_id = "PL_add_409"
-    video_id = "vid_add_409"
-    error_409 = create_http_error(409)
-    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_409
+def test_add_video_gives_up_after_repeated_connection_errors(mock_youtube_resource):
+    """Test add_video reports failure once every attempt hit a dropped connection."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = ConnectionResetError("reset")
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": []}
 
-    result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_reset", "vid_reset")
+
+    assert result is False
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == REQUEST_MAX_TRIES
+    assert mock_youtube_resource["playlistItems_list_execute"].call_count == REQUEST_MAX_TRIES
 
-    assert result is False # Treats conflict as skippable/non-fatal
-    mock_youtube_resource["log_warning"].assert_any_call(f"Video ID '{video_id}' might already be in the playlist '{playlist_id}' (API reported 409 Conflict). Skipping.")
+def test_get_available_video_ids_retries_network_timeout(mock_youtube_resource):
+    """Test that idempotent reads are still retried after a timeout."""
+    videos_list_execute = mock_youtube_resource["youtube"].videos().list().execute
+    videos_list_execute.side_effect = [TimeoutError("timed out"), {"items": [{"id": "vid1"}]}]
+
+    assert get_available_video_ids(mock_youtube_resource["youtube"], ["vid1"]) == {"vid1"}
+    assert videos_list_execute.call_count == 2
+
+def test_add_video_retries_403_rate_limit(mock_youtube_resource):
+    """Test add_video retries a 403 whose reason is a rate limit, like a 429."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = [create_http_error(403, RATE_LIMIT_EXCEEDED_BODY), {"id": "item_1"}]
+
+    result = add_video_to_playlist(mock_youtube_resource["youtube"], "PL_rate_limited", "vid_rate_limited")
+
+    assert result is True
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == 2
+    mock_youtube_resource["sleep"].assert_called_once()
     mock_youtube_resource["click_echo"].assert_not_called()
 
-def test_add_video_http_500_server_error(mock_youtube_resource):
-    """Test add_video handles 5xx server errors (non-fatal warning)."""
-    playlist_id = "PL_add_500"
-    video_id = "vid_add_500"
-    error_500 = create_http_error(500)
-    mock_youtube_resource["playlistItems_insert_execute"].side_effect = error_500
+def test_add_video_quota_exceeded_raises(mock_youtube_resource):
+    """Test add_video raises QuotaExceededError instead of reporting a per-video permission error."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = create_http_error(403, QUOTA_EXCEEDED_BODY)
 
-    result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
+    with pytest.raises(QuotaExceededError):
+        add_video_to_playlist(mock_youtube_resource["youtube"], "PL_quota", "vid_quota")
 
-    assert result is False
-    mock_youtube_resource["log_warning"].assert_any_call(f"API Server Error ({error_500.resp.status}) occurred adding video '{video_id}': {error_500}. This might resolve on its own later.")
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
     mock_youtube_resource["click_echo"].assert_not_called()
 
-def test_add_video_unexpected_error(mock_youtube_resource):
+def test_add_video_unexpected_error(mock_youtube_resource, caplog):
     """Test add_video handles unexpected non-HTTP errors."""
     playlist_id = "PL_add_broken"
     video_id = "vid_add_broken"
@@ -372,5 +588,220 @@ def test_add_video_unexpected_error(mock_youtube_resource):
     result = add_video_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_id)
 
     assert result is False
-    mock_youtube_resource["log_error"].assert_any_call(f"An unexpected error occurred adding video '{video_id}': {error_unexpected}")
-    mock_youtube_resource["click_echo"].assert_not_called() # Should log internally, maybe not echo for every unexpected add failure 
\ No newline at end of file
+    assert_logged(caplog, logging.ERROR, f"An unexpected error occurred adding video '{video_id}': {error_unexpected}")
+    mock_youtube_resource["click_echo"].assert_not_called() # Should log internally, maybe not echo for every unexpected add failure
+
+
+# --- Tests for add_videos_to_playlist ---
+
+class FakeBatch:
+    """Minimal stand-in for BatchHttpRequest that replays canned outcomes through the callback."""
+    def __init__(self, callback, outcomes, execute_error=None):
+        self.callback = callback
+        self.outcomes = outcomes
+        self.execute_error = execute_error
+        self.request_ids = []
+        self.http = None
+
+    def add(self, request, request_id=None):
+        self.request_ids.append(request_id)
+
+    def execute(self, http=None):
+        self.http = http
+        for request_id in self.request_ids:
+            if request_id not in self.outcomes:
+                break # With execute_error set: the request failed before this sub-response arrived
+            outcome = self.outcomes[request_id]
+            if isinstance(outcome, Exception):
+                self.callback(request_id, None, outcome)
+            else:
+                self.callback(request_id, outcome, None)
+        if self.execute_error is not None:
+            raise self.execute_error
+
+def install_fake_batches(youtube, outcomes, execute_error=None):
+    """Makes youtube.new_batch_http_request() hand out FakeBatch objects; returns the created batches."""
+    batches = []
+    def new_batch(callback=None):
+        batch = FakeBatch(callback, outcomes, execute_error)
+        batches.append(batch)
+        return batch
+    youtube.new_batch_http_request.side_effect = new_batch
+    return batches
+
+def test_add_videos_batch_success(mock_youtube_resource):
+    """Test adding several videos in a single batch request."""
+    playlist_id = "PL_batch"
+    video_ids = ["vid1", "vid2", "vid3"]
+    batches = install_fake_batches(mock_youtube_resource["youtube"], {vid: {"id": f"item_{vid}"} for vid in video_ids})
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_ids)
+
+    assert result == {"vid1": True, "vid2": True, "vid3": True}
+    assert len(batches) == 1
+    assert batches[0].request_ids == video_ids
+    mock_youtube_resource["playlistItems_insert_execute"].assert_not_called() # No per-video round-trips
+
+def test_add_videos_batch_chunks_by_batch_size(mock_youtube_resource):
+    """Test that inserts are split into batches of at most BATCH_SIZE."""
+    video_ids = [f"vid{i}" for i in range(BATCH_SIZE * 2 + 1)]
+    batches = install_fake_batches(mock_youtube_resource["youtube"], {vid: {"id": vid} for vid in video_ids})
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_big", video_ids)
+
+    assert all(result[vid] for vid in video_ids)
+    assert sorted(len(batch.request_ids) for batch in batches) == [1, BATCH_SIZE, BATCH_SIZE]
+
+def test_add_videos_batch_reuses_transport_per_worker(mock_youtube_resource, mocker):
+    """Test that each worker thread builds one transport and reuses it for its batches."""
+    video_ids = [f"vid{i}" for i in range(BATCH_SIZE * MAX_BATCH_WORKERS * 2)]
+    batches = install_fake_batches(mock_youtube_resource["youtube"], {vid: {"id": vid} for vid in video_ids})
+
+    mock_new_http = mocker.patch("youtube_playlist_editor.api._new_authorized_http", side_effect=lambda youtube: object())
+
+    add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_pool", video_ids)
+
+    assert len(batches) == MAX_BATCH_WORKERS * 2
+    assert mock_new_http.call_count <= MAX_BATCH_WORKERS
+    assert len({id(batch.http) for batch in batches}) == mock_new_http.call_count
+
+def test_new_authorized_http_matches_service_transport():
+    """Test that worker transports share the service's credentials but not its Http object."""
+    youtube = MagicMock()
+    youtube._http.credentials = MagicMock()
+
+    worker_http = _new_authorized_http(youtube)
+
+    assert worker_http.credentials is youtube._http.credentials
+    assert worker_http.http is not youtube._http.http
+    assert worker_http.http.timeout is not None
+    assert 308 not in worker_http.http.redirect_codes
+
+def test_add_videos_batch_retries_transient_failures(mock_youtube_resource):
+    """Test that sub-requests failing with 5xx are retried individually."""
+    playlist_id = "PL_batch_retry"
+    install_fake_batches(mock_youtube_resource["youtube"], {"vid1": {"id": "item1"}, "vid2": create_http_error(503)})
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item2"}
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, ["vid1", "vid2"])
+
+    assert result == {"vid1": True, "vid2": True}
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
+
+def test_add_videos_batch_request_failure_retries_only_missing_videos(mock_youtube_resource, caplog):
+    """Test that after a whole batch request fails, only videos confirmed missing from the playlist are re-sent."""
+    playlist_id = "PL_batch_timeout"
+    install_fake_batches(mock_youtube_resource["youtube"], {}, execute_error=TimeoutError("timed out"))
+    # vid1 was applied before the response was lost, vid2 was not, and the check for vid3 fails
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = [{"items": [{"id": "item1"}]}, {"items": []}, Exception("check failed")]
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item2"}
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, ["vid1", "vid2", "vid3"])
+
+    assert result == {"vid1": True, "vid2": True, "vid3": False}
+    mock_youtube_resource["youtube"].playlistItems().list.assert_any_call(
+        part="id", playlistId=playlist_id, videoId="vid1", maxResults=1, fields=PLAYLIST_MEMBERSHIP_FIELDS
+    )
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once() # Only vid2 is re-sent
+    assert_logged(caplog, logging.INFO, f"Video ID 'vid1' is in playlist '{playlist_id}' despite its failed batch insert. Not re-adding it.")
+    assert_logged(caplog, logging.ERROR, f"Could not check whether video 'vid3' is already in playlist '{playlist_id}': check failed")
+
+def test_add_videos_batch_request_failure_skips_already_queued_videos(mock_youtube_resource):
+    """Test that a video whose sub-response arrived before the batch request failed is not queued twice."""
+    install_fake_batches(mock_youtube_resource["youtube"], {"vid1": create_http_error(503)}, execute_error=TimeoutError("timed out"))
+    mock_youtube_resource["playlistItems_list_execute"].return_value = {"items": []}
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item"}
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_batch_partial", ["vid1", "vid2"])
+
+    assert result == {"vid1": True, "vid2": True}
+    assert mock_youtube_resource["playlistItems_insert_execute"].call_count == 2 # Once per video
+    mock_youtube_resource["playlistItems_list_execute"].assert_called_once() # Only vid2 needed a check
+
+def test_add_videos_batch_ambiguous_failures_check_playlist_first(mock_youtube_resource):
+    """Test that 409/5xx sub-responses are only re-sent after the playlist is confirmed not to contain them."""
+    playlist_id = "PL_batch_ambiguous"
+    install_fake_batches(mock_youtube_resource["youtube"], {
+        "vid1": create_http_error(500), # Applied despite the error
+        "vid2": create_http_error(409), # Already in the playlist
+        "vid3": create_http_error(502), # Not applied
+    })
+    mock_youtube_resource["playlistItems_list_execute"].side_effect = [{"items": [{"id": "item1"}]}, {"items": [{"id": "item2"}]}, {"items": []}]
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item3"}
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, ["vid1", "vid2", "vid3"])
+
+    assert result == {"vid1": True, "vid2": True, "vid3": True}
+    assert mock_youtube_resource["playlistItems_list_execute"].call_count == 3
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once() # Only vid3 is re-sent
+
+def test_add_videos_batch_reports_progress_per_video(mock_youtube_resource):
+    """Test that on_progress is called once per video, including individually retried ones."""
+    install_fake_batches(mock_youtube_resource["youtube"], {"vid1": {"id": "item1"}, "vid2": create_http_error(503)})
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item2"}
+    progress = []
+
+    add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_progress", ["vid1", "vid2"],
+                           on_progress=lambda video_id, added: progress.append((video_id, added)))
+
+    assert progress == [("vid1", True), ("vid2", True)]
+
+def test_add_videos_batch_non_retryable_failure(mock_youtube_resource):
+    """Test that non-retryable sub-request errors are reported without a retry."""
+    playlist_id = "PL_batch_403"
+    video_id = "vid_403"
+    error_403 = create_http_error(403)
+    install_fake_batches(mock_youtube_resource["youtube"], {video_id: error_403})
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, [video_id])
+
+    assert result == {video_id: False}
+    mock_youtube_resource["playlistItems_insert_execute"].assert_not_called()
+    mock_youtube_resource["click_echo"].assert_any_call(f"Error: Permission denied when adding video '{video_id}'. Check API/OAuth setup or playlist settings.", err=True)
+
+def test_add_videos_keep_order_inserts_one_at_a_time(mock_youtube_resource):
+    """Test that keep_order sends individual inserts in the given order instead of batches."""
+    playlist_id = "PL_ordered"
+    video_ids = ["vid3", "vid1", "vid2"]
+    mock_youtube_resource["playlistItems_insert_execute"].return_value = {"id": "item"}
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, video_ids, keep_order=True)
+
+    assert result == {"vid3": True, "vid1": True, "vid2": True}
+    mock_youtube_resource["youtube"].new_batch_http_request.assert_not_called()
+    inserted = [kwargs["body"]["snippet"]["resourceId"]["videoId"]
+                for _, kwargs in mock_youtube_resource["youtube"].playlistItems().insert.call_args_list]
+    assert inserted == video_ids
+
+def test_add_videos_batch_quota_exceeded_stops_run(mock_youtube_resource, caplog):
+    """Test that a quotaExceeded sub-response stops further inserts and is reported once."""
+    playlist_id = "PL_batch_quota"
+    install_fake_batches(mock_youtube_resource["youtube"], {
+        "vid1": create_http_error(403, QUOTA_EXCEEDED_BODY),
+        "vid2": create_http_error(403, QUOTA_EXCEEDED_BODY),
+        "vid3": create_http_error(503), # Would normally be retried individually
+    })
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], playlist_id, ["vid1", "vid2", "vid3"])
+
+    assert result == {"vid1": False, "vid2": False, "vid3": False}
+    mock_youtube_resource["playlistItems_insert_execute"].assert_not_called()
+    mock_youtube_resource["click_echo"].assert_called_once_with(QUOTA_EXCEEDED_MESSAGE, err=True)
+    assert_logged(caplog, logging.ERROR, f"YouTube API quota exceeded while adding videos to playlist '{playlist_id}'. Remaining videos were not added.")
+
+def test_add_videos_keep_order_stops_at_quota_exceeded(mock_youtube_resource):
+    """Test that ordered inserts stop at the first quotaExceeded instead of failing every remaining video."""
+    mock_youtube_resource["playlistItems_insert_execute"].side_effect = create_http_error(403, QUOTA_EXCEEDED_BODY)
+
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_ordered_quota", ["vid1", "vid2", "vid3"], keep_order=True)
+
+    assert result == {"vid1": False, "vid2": False, "vid3": False}
+    mock_youtube_resource["playlistItems_insert_execute"].assert_called_once()
+    mock_youtube_resource["click_echo"].assert_called_once_with(QUOTA_EXCEEDED_MESSAGE, err=True)
+
+def test_add_videos_batch_empty(mock_youtube_resource):
+    """Test that no batch request is made when there is nothing to add."""
+    result = add_videos_to_playlist(mock_youtube_resource["youtube"], "PL_empty", [])
+
+    assert result == {}
+    mock_youtube_resource["youtube"].new_batch_http_request.assert_not_called()
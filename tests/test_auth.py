@@ -1,10 +1,9 @@
 # Placeholder for auth tests 
 
 import pytest
-import pickle
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, call
+from unittest.mock import MagicMock, call
 
 # Import actual classes for spec'ing
 from google.oauth2.credentials import Credentials
@@ -13,6 +12,8 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError # Keep this if needed by tests directly
 
+from youtube_playlist_editor.auth import get_authenticated_service
+
 # Mock classes/objects from google libraries
 MockCredentials = MagicMock()
 MockRequest = MagicMock()
@@ -21,7 +22,7 @@ MockResource = MagicMock() # Mock for the returned service object
 
 # Define constants used in the auth module
 CLIENT_SECRETS_FILE = "client_secrets.json"
-TOKEN_PICKLE_FILE = "token.pickle"
+TOKEN_FILE = "token.json"
 API_SERVICE_NAME = "youtube"
 API_VERSION = "v3"
 SCOPES = ["https://www.googleapis.com/auth/youtube"]
@@ -36,14 +37,14 @@ def mock_auth_env(mocker):
 
     # Create distinct mock objects for the resolved paths
     mock_secrets_path = MagicMock(spec=Path, name=CLIENT_SECRETS_FILE)
-    mock_token_path = MagicMock(spec=Path, name=TOKEN_PICKLE_FILE)
+    mock_token_path = MagicMock(spec=Path, name=TOKEN_FILE)
 
     # Configure the base Path() call to return a mock that can be divided
     mock_base_path_instance = MagicMock(spec=Path)
     def truediv_side_effect(part):
         if part == CLIENT_SECRETS_FILE:
             return mock_secrets_path
-        elif part == TOKEN_PICKLE_FILE:
+        elif part == TOKEN_FILE:
             return mock_token_path
         return MagicMock(spec=Path)
     mock_base_path_instance.__truediv__.side_effect = truediv_side_effect
@@ -55,31 +56,29 @@ def mock_auth_env(mocker):
 
     # Mock methods on the specific path objects
     mock_secrets_path.resolve.return_value = Path(f"/fake/{CLIENT_SECRETS_FILE}")
-    mock_token_path.resolve.return_value = Path(f"/fake/{TOKEN_PICKLE_FILE}")
+    mock_token_path.resolve.return_value = Path(f"/fake/{TOKEN_FILE}")
     mock_token_path.unlink.return_value = None # For deletion after failed refresh
 
     # Add __str__ mocking for path objects used in function calls
     mock_secrets_path.__str__.return_value = f"/fake/{CLIENT_SECRETS_FILE}"
-    mock_token_path.__str__.return_value = f"/fake/{TOKEN_PICKLE_FILE}"
-
-    # Simplify open/pickle mocking
-    # Patch open with mock_open to handle context manager
-    mock_open_func = mock_open()
-    mocker.patch("youtube_playlist_editor.auth.open", mock_open_func)
-    # Mock pickle load/dump directly
-    mock_pickle_load = mocker.patch("youtube_playlist_editor.auth.pickle.load")
-    mock_pickle_dump = mocker.patch("youtube_playlist_editor.auth.pickle.dump")
+    mock_token_path.__str__.return_value = f"/fake/{TOKEN_FILE}"
 
     # Mock google auth/api libraries
-    mock_creds_class = mocker.patch("youtube_playlist_editor.auth.Credentials", spec=Credentials)
-    mock_request_class = mocker.patch("youtube_playlist_editor.auth.Request", spec=Request)
+    # auth.py imports the Google libraries inside get_authenticated_service,
+    # so they are patched where they are defined rather than on the auth module.
+    mock_creds_class = mocker.patch("google.oauth2.credentials.Credentials", spec=Credentials)
+    # Token is loaded via Credentials.from_authorized_user_file and saved via Path.write_text
+    mock_load_token = mock_creds_class.from_authorized_user_file
+    mock_write_token = mock_token_path.write_text
+    mock_request_class = mocker.patch("google.auth.transport.requests.Request", spec=Request)
     # Directly mock the from_client_secrets_file method
-    mock_flow_from_secrets = mocker.patch("youtube_playlist_editor.auth.InstalledAppFlow.from_client_secrets_file")
+    mock_flow_from_secrets = mocker.patch("google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file")
     mock_flow_instance = mock_flow_from_secrets.return_value
     mock_flow_instance.run_local_server = MagicMock()
 
     mock_build_service = MagicMock(spec=Resource)
-    mock_build = mocker.patch("youtube_playlist_editor.auth.build", return_value=mock_build_service)
+    mock_build = mocker.patch("googleapiclient.discovery.build", return_value=mock_build_service)
+    mock_json_model = mocker.patch("youtube_playlist_editor.json_model.get_json_model").return_value
 
     # Mock system exit & click
     mock_sys_exit = mocker.patch("sys.exit", side_effect=lambda code=None: exec("raise SystemExit(code)"))
@@ -94,9 +93,8 @@ def mock_auth_env(mocker):
     return {
         "secrets_path": mock_secrets_path,
         "token_path": mock_token_path,
-        "open": mock_open_func,
-        "pickle_load": mock_pickle_load,
-        "pickle_dump": mock_pickle_dump,
+        "load_token": mock_load_token,
+        "write_token": mock_write_token,
         "Credentials": mock_creds_class,
         "Request": mock_request_class,
         # Replace class mock with method mock
@@ -104,6 +102,7 @@ def mock_auth_env(mocker):
         "flow_instance": mock_flow_instance,
         "build": mock_build,
         "build_service": mock_build_service,
+        "json_model": mock_json_model,
         "sys_exit": mock_sys_exit,
         "click_echo": mock_click_echo,
         "log_info": mock_log_info,
@@ -132,7 +131,6 @@ def test_get_authenticated_service_no_secrets_file(mock_auth_env):
     # Arrange: Default state is secrets_path.exists = False
 
     # Act & Assert
-    from youtube_playlist_editor.auth import get_authenticated_service
     with pytest.raises(SystemExit) as exc_info:
         get_authenticated_service()
     # Assert on the caught exception code
@@ -147,56 +145,54 @@ def test_get_authenticated_service_no_secrets_file(mock_auth_env):
 
 
 def test_get_authenticated_service_valid_token_exists(mock_auth_env):
-    """Test behavior when a valid token.pickle exists."""
+    """Test behavior when a valid token.json exists."""
     # Arrange
     mock_auth_env["secrets_path"].exists.return_value = True
     mock_auth_env["token_path"].exists.return_value = True
     mock_valid_creds = MagicMock(spec=Credentials)
     mock_valid_creds.valid = True
     mock_valid_creds.expired = False
-    mock_auth_env["pickle_load"].return_value = mock_valid_creds
+    mock_auth_env["load_token"].return_value = mock_valid_creds
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
     mock_auth_env["secrets_path"].exists.assert_called_once()
     mock_auth_env["token_path"].exists.assert_called_once()
-    mock_auth_env["pickle_load"].assert_called_once()
+    mock_auth_env["load_token"].assert_called_once_with(str(mock_auth_env["token_path"]), SCOPES)
     mock_auth_env["log_info"].assert_any_call(f"Loaded credentials from {mock_auth_env['token_path']}")
     mock_auth_env["from_client_secrets_file"].assert_not_called()
-    mock_auth_env["pickle_dump"].assert_not_called()
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_valid_creds)
+    mock_auth_env["write_token"].assert_not_called()
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_valid_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["sys_exit"].assert_not_called()
 
 
 def test_get_authenticated_service_token_load_fails(mock_auth_env):
-    """Test behavior when token.pickle exists but loading fails."""
+    """Test behavior when token.json exists but loading fails."""
     # Arrange
     mock_auth_env["secrets_path"].exists.return_value = True
     mock_auth_env["token_path"].exists.return_value = True
-    mock_auth_env["pickle_load"].side_effect = EOFError("Simulated pickle error")
+    mock_auth_env["load_token"].side_effect = ValueError("Simulated token parse error")
     mock_new_creds = MagicMock(spec=Credentials)
     mock_auth_env["flow_instance"].run_local_server.return_value = mock_new_creds
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
     mock_auth_env["token_path"].exists.assert_called_once()
-    mock_auth_env["pickle_load"].assert_called_once()
-    mock_auth_env["log_warning"].assert_any_call(f"Could not load token file ({mock_auth_env['token_path']}): Simulated pickle error. Re-authenticating.")
+    mock_auth_env["load_token"].assert_called_once()
+    mock_auth_env["log_warning"].assert_any_call(f"Could not load token file ({mock_auth_env['token_path']}): Simulated token parse error. Re-authenticating.")
     mock_auth_env["from_client_secrets_file"].assert_called_once_with(
         str(mock_auth_env["secrets_path"]), SCOPES
     )
     mock_auth_env["flow_instance"].run_local_server.assert_called_once_with(port=0)
-    # Check saving the new token - assert dump called with creds and the handle from mock_open
-    mock_auth_env["pickle_dump"].assert_called_once_with(mock_new_creds, mock_auth_env["open"].return_value)
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds)
+    # Check saving the new token - assert the creds' JSON was written to the token file
+    mock_auth_env["write_token"].assert_called_once_with(mock_new_creds.to_json.return_value)
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["sys_exit"].assert_not_called()
 
 
@@ -210,20 +206,19 @@ def test_get_authenticated_service_expired_token_refresh_success(mock_auth_env):
     mock_expired_creds.expired = True
     mock_expired_creds.refresh_token = "fake_refresh_token"
     mock_expired_creds.refresh.return_value = None
-    mock_auth_env["pickle_load"].return_value = mock_expired_creds
+    mock_auth_env["load_token"].return_value = mock_expired_creds
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
-    mock_auth_env["pickle_load"].assert_called_once()
+    mock_auth_env["load_token"].assert_called_once()
     mock_expired_creds.refresh.assert_called_once_with(mock_auth_env["Request"].return_value)
     mock_auth_env["log_info"].assert_any_call("Credentials expired, refreshing...")
-    # Check saving refreshed token - assert dump called with creds and handle
-    mock_auth_env["pickle_dump"].assert_called_once_with(mock_expired_creds, mock_auth_env["open"].return_value)
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_expired_creds)
+    # Check saving refreshed token - assert the creds' JSON was written to the token file
+    mock_auth_env["write_token"].assert_called_once_with(mock_expired_creds.to_json.return_value)
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_expired_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["from_client_secrets_file"].assert_not_called()
     mock_auth_env["sys_exit"].assert_not_called()
 
@@ -239,17 +234,16 @@ def test_get_authenticated_service_expired_token_refresh_fails(mock_auth_env):
     mock_expired_creds.refresh_token = "fake_refresh_token"
     refresh_exception = Exception("Refresh failed")
     mock_expired_creds.refresh.side_effect = refresh_exception
-    mock_auth_env["pickle_load"].return_value = mock_expired_creds
+    mock_auth_env["load_token"].return_value = mock_expired_creds
     mock_new_creds = MagicMock(spec=Credentials)
     mock_auth_env["flow_instance"].run_local_server.return_value = mock_new_creds
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
-    mock_auth_env["pickle_load"].assert_called_once()
+    mock_auth_env["load_token"].assert_called_once()
     mock_expired_creds.refresh.assert_called_once_with(mock_auth_env["Request"].return_value)
     mock_auth_env["log_warning"].assert_any_call(f"Failed to refresh token: {refresh_exception}. Re-authenticating by removing token.")
     # Check token deletion was attempted
@@ -262,9 +256,9 @@ def test_get_authenticated_service_expired_token_refresh_fails(mock_auth_env):
         str(mock_auth_env["secrets_path"]), SCOPES
     )
     mock_auth_env["flow_instance"].run_local_server.assert_called_once_with(port=0)
-    # Check saving new token - assert dump called with creds and handle
-    mock_auth_env["pickle_dump"].assert_called_once_with(mock_new_creds, mock_auth_env["open"].return_value)
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds)
+    # Check saving new token - assert the creds' JSON was written to the token file
+    mock_auth_env["write_token"].assert_called_once_with(mock_new_creds.to_json.return_value)
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["sys_exit"].assert_not_called()
 
 
@@ -277,22 +271,21 @@ def test_get_authenticated_service_no_token_file_flow_success(mock_auth_env):
     mock_auth_env["flow_instance"].run_local_server.return_value = mock_new_creds
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
     mock_auth_env["token_path"].exists.assert_called_once()
-    mock_auth_env["pickle_load"].assert_not_called()
+    mock_auth_env["load_token"].assert_not_called()
     mock_auth_env["log_info"].assert_any_call("No valid credentials available, starting authentication flow.")
     mock_auth_env["from_client_secrets_file"].assert_called_once_with(
         str(mock_auth_env["secrets_path"]), SCOPES
     )
     mock_auth_env["flow_instance"].run_local_server.assert_called_once_with(port=0)
-    # Check saving the new token - assert dump called with creds and handle
-    mock_auth_env["pickle_dump"].assert_called_once_with(mock_new_creds, mock_auth_env["open"].return_value)
+    # Check saving the new token - assert the creds' JSON was written to the token file
+    mock_auth_env["write_token"].assert_called_once_with(mock_new_creds.to_json.return_value)
     mock_auth_env["log_info"].assert_any_call(f"New credentials saved to {mock_auth_env['token_path']}")
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds)
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["sys_exit"].assert_not_called()
 
 
@@ -305,7 +298,6 @@ def test_get_authenticated_service_flow_fails(mock_auth_env):
     mock_auth_env["flow_instance"].run_local_server.side_effect = flow_exception
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
@@ -314,7 +306,7 @@ def test_get_authenticated_service_flow_fails(mock_auth_env):
     mock_auth_env["flow_instance"].run_local_server.assert_called_once()
     mock_auth_env["log_error"].assert_any_call(f"Authentication flow failed: {flow_exception}", exc_info=True)
     mock_auth_env["click_echo"].assert_any_call(f"Error during authentication: {flow_exception}", err=True)
-    mock_auth_env["pickle_dump"].assert_not_called()
+    mock_auth_env["write_token"].assert_not_called()
     mock_auth_env["build"].assert_not_called()
     mock_auth_env["sys_exit"].assert_not_called()
 
@@ -327,19 +319,18 @@ def test_get_authenticated_service_token_save_fails(mock_auth_env):
     mock_new_creds = MagicMock(spec=Credentials)
     mock_auth_env["flow_instance"].run_local_server.return_value = mock_new_creds
     save_exception = OSError("Cannot write token")
-    mock_auth_env["pickle_dump"].side_effect = save_exception
+    mock_auth_env["write_token"].side_effect = save_exception
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result == mock_auth_env["build_service"]
     mock_auth_env["flow_instance"].run_local_server.assert_called_once()
-    mock_auth_env["pickle_dump"].assert_called_once()
+    mock_auth_env["write_token"].assert_called_once()
     mock_auth_env["log_error"].assert_any_call(f"Failed to save new token to {mock_auth_env['token_path']}: {save_exception}")
     mock_auth_env["click_echo"].assert_any_call(f"Warning: Could not save new credentials to {mock_auth_env['token_path']}: {save_exception}", err=True)
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds)
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_new_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
 
 
 def test_get_authenticated_service_build_fails(mock_auth_env):
@@ -348,17 +339,16 @@ def test_get_authenticated_service_build_fails(mock_auth_env):
     mock_auth_env["token_path"].exists.return_value = True
     mock_valid_creds = MagicMock(spec=Credentials)
     mock_valid_creds.valid = True
-    mock_auth_env["pickle_load"].return_value = mock_valid_creds
+    mock_auth_env["load_token"].return_value = mock_valid_creds
     build_exception = HttpError(MagicMock(status=500), b"Build failed")
     mock_auth_env["build"].side_effect = build_exception
 
     # Act
-    from youtube_playlist_editor.auth import get_authenticated_service
     result = get_authenticated_service()
 
     # Assert
     assert result is None
-    mock_auth_env["pickle_load"].assert_called_once()
-    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_valid_creds)
+    mock_auth_env["load_token"].assert_called_once()
+    mock_auth_env["build"].assert_called_once_with(API_SERVICE_NAME, API_VERSION, credentials=mock_valid_creds, model=mock_auth_env["json_model"], static_discovery=True, cache_discovery=False)
     mock_auth_env["log_error"].assert_any_call(f"Failed to build YouTube service: {build_exception}")
     mock_auth_env["click_echo"].assert_any_call(f"Error building YouTube service: {build_exception}", err=True) 
\ No newline at end of file
@@ -1,8 +1,9 @@
 # Placeholder for cli tests 
 
 import pytest
+import logging
 from click.testing import CliRunner
-from unittest.mock import MagicMock, mock_open, call, patch
+from unittest.mock import ANY, MagicMock, call, patch
 from pathlib import Path
 
 # Import the CLI application
@@ -12,30 +13,41 @@ from youtube_playlist_editor import auth, api, utils
 
 # --- Fixtures ---
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def runner():
-    """Provides a CliRunner instance."""
+    """Provides a CliRunner instance (stateless between invocations, so shared per module)."""
     return CliRunner()
 
+@pytest.fixture(autouse=True)
+def mock_get_available():
+    """Treats every queued video as available unless a test configures otherwise."""
+    with patch("youtube_playlist_editor.cli.get_available_video_ids", side_effect=lambda youtube, video_ids: set(video_ids)) as mock:
+        yield mock
+
+def summary_calls(added=0, invalid=0, duplicate=0, unavailable=0, errors=0):
+    """Builds the click.echo calls for the summary printed at the end of 'add' (its last six echoes)."""
+    return [
+        call("\n--- Summary ---"),
+        call(f"Successfully added: {added} videos."),
+        call(f"Skipped (invalid URL/ID): {invalid} lines."),
+        call(f"Skipped (duplicate): {duplicate} videos."),
+        call(f"Skipped (unavailable/private): {unavailable} videos."),
+        call(f"Errors during addition: {errors} videos."),
+    ]
+
 # --- Test Cases ---
 
 # Use patch decorators to mock functions *before* the test runs
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
 @patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
-@patch("youtube_playlist_editor.cli.add_video_to_playlist")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
 @patch("youtube_playlist_editor.cli.extract_video_id")
-@patch("youtube_playlist_editor.cli.Path") # Mock Path used by click.Path
-@patch("builtins.open") # Mock open used by cli.add to read file
 @patch("click.echo") # Mock echo for checking output
 def test_add_command_success(
     mock_echo,
-    mock_builtin_open,
-    mock_cli_path,
     mock_extract,
     mock_add,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
@@ -51,51 +63,30 @@ def test_add_command_success(
     # Configure mocks passed as arguments by decorators
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = True
     mock_get_existing.return_value = set()
-    mock_add.return_value = True
+    mock_add.return_value = {"vid1": True, "vid2": True}
     mock_extract.side_effect = ["vid1", "vid2"]
 
-    # Configure Path mock for click.Path check
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
-    # Configure builtin open mock for reading the file
-    mock_builtin_open.return_value = mock_open(read_data=input_content).return_value
-
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
 
     # Assert
     assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
     mock_get_auth.assert_called_once()
-    mock_verify.assert_called_once_with(mock_youtube_service, playlist_id)
-    mock_get_existing.assert_called_once_with(mock_youtube_service, playlist_id)
+    mock_get_existing.assert_called_once_with(mock_youtube_service, playlist_id, use_cache=True)
     mock_extract.assert_has_calls([
         call("https://youtu.be/vid1"),
         call("https://www.youtube.com/watch?v=vid2")
     ])
-    mock_add.assert_has_calls([
-        call(mock_youtube_service, playlist_id, "vid1"),
-        call(mock_youtube_service, playlist_id, "vid2")
-    ])
-    assert mock_add.call_count == 2
-    mock_echo.assert_has_calls([
-        call("\n--- Summary ---"),
-        call("Successfully added: 2 videos."),
-        call("Skipped (invalid URL/ID): 0 lines."),
-        call("Skipped (duplicate): 0 videos."),
-        call("Errors during addition: 0 videos.")
-    ], any_order=False)
+    mock_add.assert_called_once_with(mock_youtube_service, playlist_id, ["vid1", "vid2"], on_progress=ANY, keep_order=False)
+    assert mock_echo.call_args_list[-6:] == summary_calls(added=2)
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists") # Still need to patch downstream
-@patch("youtube_playlist_editor.cli.Path")
+@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids") # Still need to patch downstream
 @patch("click.echo")
 def test_add_command_authentication_fails(
     mock_echo,
-    mock_cli_path,
-    mock_verify,
+    mock_get_existing,
     mock_get_auth,
     runner,
     tmp_path
@@ -108,10 +99,6 @@ def test_add_command_authentication_fails(
     input_file_str = str(input_file_path_obj)
 
     mock_get_auth.return_value = None # Simulate auth failure
-    # Configure Path mock for click.Path check
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
@@ -120,21 +107,19 @@ def test_add_command_authentication_fails(
     assert result.exit_code == 1, f"CLI should exit with 1 on auth fail. Output: {result.output}\nException: {result.exception}"
     mock_get_auth.assert_called_once()
     mock_echo.assert_any_call("Failed to authenticate with YouTube API. Exiting.", err=True)
-    mock_verify.assert_not_called()
+    mock_get_existing.assert_not_called()
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
-@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids") # Patch downstream
-@patch("youtube_playlist_editor.cli.Path")
+@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist") # Patch downstream
 def test_add_command_playlist_verification_fails(
-    mock_cli_path,
+    mock_add,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
 ):
-    """Test behavior when playlist verification fails."""
+    """Test behavior when the playlist is not found while fetching its existing items."""
     # Arrange
     playlist_id = "PL_verify_fail"
     input_file_path_obj = tmp_path / "videos.txt"
@@ -143,11 +128,7 @@ def test_add_command_playlist_verification_fails(
 
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = False # Simulate verify failure
-    # Configure Path mock for click.Path check
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
+    mock_get_existing.return_value = None # Simulate playlist not found / inaccessible
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
@@ -155,27 +136,21 @@ def test_add_command_playlist_verification_fails(
     # Assert
     assert result.exit_code == 1, f"CLI should exit with 1 on verify fail. Output: {result.output}\nException: {result.exception}"
     mock_get_auth.assert_called_once()
-    mock_verify.assert_called_once_with(mock_youtube_service, playlist_id)
-    mock_get_existing.assert_not_called()
+    mock_get_existing.assert_called_once_with(mock_youtube_service, playlist_id, use_cache=True)
+    mock_add.assert_not_called()
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
 @patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
-@patch("youtube_playlist_editor.cli.add_video_to_playlist")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
 @patch("youtube_playlist_editor.cli.extract_video_id")
-@patch("youtube_playlist_editor.cli.Path")
-@patch("builtins.open")
 @patch("click.echo")
-@patch("logging.info") # Mock logging to check duplicate message
+@patch("logging.debug") # Mock logging to check duplicate message
 def test_add_command_handles_duplicates(
-    mock_log_info,
+    mock_log_debug,
     mock_echo,
-    mock_builtin_open,
-    mock_cli_path,
     mock_extract,
     mock_add,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
@@ -195,14 +170,9 @@ def test_add_command_handles_duplicates(
 
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = True
     mock_get_existing.return_value = {"vid2"} # vid2 already exists
-    mock_add.return_value = True
+    mock_add.return_value = {"vid1": True, "vid3": True}
     mock_extract.side_effect = ["vid1", "vid2", "vid1", "vid3"]
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
-    mock_builtin_open.return_value = mock_open(read_data=input_content).return_value
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
@@ -210,37 +180,21 @@ def test_add_command_handles_duplicates(
     # Assert
     assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
     mock_get_existing.assert_called_once()
-    mock_add.assert_has_calls([
-        call(mock_youtube_service, playlist_id, "vid1"),
-        call(mock_youtube_service, playlist_id, "vid3")
-    ])
-    assert mock_add.call_count == 2
-    mock_log_info.assert_any_call("Skipping duplicate video ID: vid2 (already in playlist)")
-    mock_log_info.assert_any_call("Skipping duplicate video ID: vid1 (already in playlist)")
-    mock_echo.assert_has_calls([
-        call("\n--- Summary ---"),
-        call("Successfully added: 2 videos."),
-        call("Skipped (invalid URL/ID): 0 lines."),
-        call("Skipped (duplicate): 2 videos."),
-        call("Errors during addition: 0 videos.")
-    ], any_order=False)
+    mock_add.assert_called_once_with(mock_youtube_service, playlist_id, ["vid1", "vid3"], on_progress=ANY, keep_order=False)
+    mock_log_debug.assert_any_call("Skipping duplicate video ID: vid2 (already in playlist)")
+    mock_log_debug.assert_any_call("Skipping duplicate video ID: vid1 (listed earlier in the file)")
+    assert mock_echo.call_args_list[-6:] == summary_calls(added=2, duplicate=2)
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
 @patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
-@patch("youtube_playlist_editor.cli.add_video_to_playlist")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
 @patch("youtube_playlist_editor.cli.extract_video_id")
-@patch("youtube_playlist_editor.cli.Path")
-@patch("builtins.open")
 @patch("click.echo")
 def test_add_command_handles_invalid_urls(
     mock_echo,
-    mock_builtin_open,
-    mock_cli_path,
     mock_extract,
     mock_add,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
@@ -261,52 +215,36 @@ def test_add_command_handles_invalid_urls(
 
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = True
     mock_get_existing.return_value = set()
-    mock_add.return_value = True
+    mock_add.return_value = {"vid1": True}
     mock_extract.side_effect = ["vid1", None, None]
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
-    mock_builtin_open.return_value = mock_open(read_data=input_content).return_value
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
 
     # Assert
     assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
-    mock_add.assert_called_once_with(mock_youtube_service, playlist_id, "vid1")
-    mock_echo.assert_any_call("Warning: Could not extract video ID from line 2: 'not a url'", err=True)
-    mock_echo.assert_any_call("Warning: Could not extract video ID from line 3: 'https://example.com'", err=True)
-    mock_echo.assert_has_calls([
-        call("\n--- Summary ---"),
-        call("Successfully added: 1 videos."),
-        call("Skipped (invalid URL/ID): 2 lines."),
-        call("Skipped (duplicate): 0 videos."),
-        call("Errors during addition: 0 videos.")
-    ], any_order=False)
+    mock_add.assert_called_once_with(mock_youtube_service, playlist_id, ["vid1"], on_progress=ANY, keep_order=False)
+    # Invalid-line warnings are collected and written in a single call
+    mock_echo.assert_any_call("Warning: Could not extract video ID from line 2: 'not a url'\n"
+                              "Warning: Could not extract video ID from line 3: 'https://example.com'", err=True)
+    assert mock_echo.call_args_list[-6:] == summary_calls(added=1, invalid=2)
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
 @patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
-@patch("youtube_playlist_editor.cli.add_video_to_playlist")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
 @patch("youtube_playlist_editor.cli.extract_video_id")
-@patch("youtube_playlist_editor.cli.Path")
-@patch("builtins.open")
 @patch("click.echo")
 def test_add_command_handles_add_video_errors(
     mock_echo,
-    mock_builtin_open,
-    mock_cli_path,
     mock_extract,
     mock_add,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
 ):
-    """Test counting errors when add_video_to_playlist returns False."""
+    """Test counting errors when add_videos_to_playlist reports failures."""
     # Arrange
     playlist_id = "PL_add_fail"
     input_content = "https://youtu.be/vid1\nhttps://youtu.be/vid2"
@@ -316,36 +254,20 @@ def test_add_command_handles_add_video_errors(
 
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = True
     mock_get_existing.return_value = set()
-    mock_add.side_effect = [True, False] # Simulate first add succeeds, second fails
+    mock_add.return_value = {"vid1": True, "vid2": False} # Simulate first add succeeds, second fails
     mock_extract.side_effect = ["vid1", "vid2"]
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
-    mock_builtin_open.return_value = mock_open(read_data=input_content).return_value
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
 
     # Assert
     assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
-    mock_add.assert_has_calls([
-        call(mock_youtube_service, playlist_id, "vid1"),
-        call(mock_youtube_service, playlist_id, "vid2")
-    ])
-    mock_echo.assert_has_calls([
-        call("\n--- Summary ---"),
-        call("Successfully added: 1 videos."),
-        call("Skipped (invalid URL/ID): 0 lines."),
-        call("Skipped (duplicate): 0 videos."),
-        call("Errors during addition: 1 videos.")
-    ], any_order=False)
+    mock_add.assert_called_once_with(mock_youtube_service, playlist_id, ["vid1", "vid2"], on_progress=ANY, keep_order=False)
+    assert mock_echo.call_args_list[-6:] == summary_calls(added=1, errors=1)
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service") # Patch downstream
-@patch("youtube_playlist_editor.cli.Path")
 def test_add_command_file_not_found(
-    mock_cli_path,
     mock_get_auth,
     runner
 ):
@@ -354,11 +276,6 @@ def test_add_command_file_not_found(
     playlist_id = "PL_file_fail"
     non_existent_file = "non_existent_videos.txt"
 
-    # Configure Path mock for click.Path check
-    mock_cli_path.return_value.exists.return_value = False
-    mock_cli_path.return_value.is_file.return_value = False
-    mock_cli_path.return_value.is_dir.return_value = False
-
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', non_existent_file, '-p', playlist_id])
 
@@ -368,19 +285,15 @@ def test_add_command_file_not_found(
     mock_get_auth.assert_not_called()
 
 @patch("youtube_playlist_editor.cli.get_authenticated_service")
-@patch("youtube_playlist_editor.cli.verify_playlist_exists")
 @patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
-@patch("youtube_playlist_editor.cli.Path")
-@patch("builtins.open")
+@patch("youtube_playlist_editor.cli.iter_url_lines")
 @patch("logging.error") # Mock logging
 @patch("click.echo")
 def test_add_command_file_processing_error(
     mock_echo,
     mock_log_error,
-    mock_builtin_open,
-    mock_cli_path,
+    mock_iter_lines,
     mock_get_existing,
-    mock_verify,
     mock_get_auth,
     runner,
     tmp_path
@@ -394,14 +307,10 @@ def test_add_command_file_processing_error(
 
     mock_youtube_service = MagicMock()
     mock_get_auth.return_value = mock_youtube_service
-    mock_verify.return_value = True
     mock_get_existing.return_value = set()
-    mock_cli_path.return_value.exists.return_value = True
-    mock_cli_path.return_value.is_file.return_value = True
-    mock_cli_path.return_value.is_dir.return_value = False
-    # Mock open to raise error during iteration
+    # Mock the line reader to raise an error while reading
     read_error = IOError("Disk read error")
-    mock_builtin_open.return_value.__enter__.return_value.__iter__.side_effect = read_error
+    mock_iter_lines.side_effect = read_error
 
     # Act
     result = runner.invoke(cli.cli, ['add', '-f', input_file_str, '-p', playlist_id])
@@ -411,4 +320,84 @@ def test_add_command_file_processing_error(
     mock_log_error.assert_any_call(f"An error occurred processing the file '{input_file_str}': {read_error}", exc_info=True)
     mock_echo.assert_any_call(f"An unexpected error occurred processing the file: {read_error}", err=True)
 
+@patch("youtube_playlist_editor.cli.get_authenticated_service")
+@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
+def test_add_command_refresh_cache(mock_add, mock_get_existing, mock_get_auth, runner, tmp_path):
+    """Test that --refresh-cache bypasses the cached playlist contents."""
+    input_file_path_obj = tmp_path / "videos.txt"
+    input_file_path_obj.write_text("https://youtu.be/dQw4w9WgXcQ\n")
+    mock_youtube_service = MagicMock()
+    mock_get_auth.return_value = mock_youtube_service
+    mock_get_existing.return_value = set()
+    mock_add.return_value = {"dQw4w9WgXcQ": True}
+
+    result = runner.invoke(cli.cli, ['add', '-f', str(input_file_path_obj), '-p', "PL_refresh", '--refresh-cache'])
+
+    assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
+    mock_get_existing.assert_called_once_with(mock_youtube_service, "PL_refresh", use_cache=False)
+
+@patch("youtube_playlist_editor.cli.get_authenticated_service")
+@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
+def test_add_command_keep_order(mock_add, mock_get_existing, mock_get_auth, runner, tmp_path):
+    """Test that --keep-order asks for the videos to be inserted in file order."""
+    input_file_path_obj = tmp_path / "videos.txt"
+    input_file_path_obj.write_text("https://youtu.be/oHg5SJYRHA0\nhttps://youtu.be/dQw4w9WgXcQ\n")
+    mock_youtube_service = MagicMock()
+    mock_get_auth.return_value = mock_youtube_service
+    mock_get_existing.return_value = set()
+    mock_add.return_value = {"oHg5SJYRHA0": True, "dQw4w9WgXcQ": True}
+
+    result = runner.invoke(cli.cli, ['add', '-f', str(input_file_path_obj), '-p', "PL_ordered", '--keep-order'])
+
+    assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
+    mock_add.assert_called_once_with(mock_youtube_service, "PL_ordered", ["oHg5SJYRHA0", "dQw4w9WgXcQ"], on_progress=ANY, keep_order=True)
+
+@patch("youtube_playlist_editor.cli.get_authenticated_service")
+@patch("youtube_playlist_editor.cli.get_existing_playlist_video_ids")
+@patch("youtube_playlist_editor.cli.add_videos_to_playlist")
+@patch("click.echo")
+def test_add_command_skips_unavailable_videos(mock_echo, mock_add, mock_get_existing, mock_get_auth, mock_get_available, runner, tmp_path):
+    """Test that videos reported missing/private are skipped before inserting."""
+    input_file_path_obj = tmp_path / "videos.txt"
+    input_file_path_obj.write_text("https://youtu.be/dQw4w9WgXcQ\nhttps://youtu.be/oHg5SJYRHA0\n")
+    mock_youtube_service = MagicMock()
+    mock_get_auth.return_value = mock_youtube_service
+    mock_get_existing.return_value = set()
+    mock_get_available.side_effect = None
+    mock_get_available.return_value = {"oHg5SJYRHA0"}
+    mock_add.return_value = {"oHg5SJYRHA0": True}
+
+    result = runner.invoke(cli.cli, ['add', '-f', str(input_file_path_obj), '-p', "PL_unavailable"])
+
+    assert result.exit_code == 0, f"CLI failed with output: {result.output}\nException: {result.exception}"
+    mock_get_available.assert_called_once_with(mock_youtube_service, ["dQw4w9WgXcQ", "oHg5SJYRHA0"])
+    mock_add.assert_called_once_with(mock_youtube_service, "PL_unavailable", ["oHg5SJYRHA0"], on_progress=ANY, keep_order=False)
+    assert mock_echo.call_args_list[-6:] == summary_calls(added=1, unavailable=1)
+
+@patch("youtube_playlist_editor.cli.get_authenticated_service")
+def test_verbose_flag_enables_debug_logging(mock_get_auth, runner, tmp_path):
+    """Test that --verbose lowers the root log level to DEBUG."""
+    input_file_path_obj = tmp_path / "videos.txt"
+    input_file_path_obj.touch()
+    mock_get_auth.return_value = None # Stop right after authentication
+    root_logger = logging.getLogger()
+    original_level = root_logger.level
+    try:
+        runner.invoke(cli.cli, ['--verbose', 'add', '-f', str(input_file_path_obj), '-p', "PL_verbose"])
+        assert root_logger.level == logging.DEBUG
+    finally:
+        root_logger.setLevel(original_level)
+
+def test_extract_all_ids_reads_file(tmp_path):
+    """Test the worker-thread parse step returns line numbers, URLs and extracted IDs."""
+    input_file = tmp_path / "videos.txt"
+    input_file.write_text("# comment\nhttps://youtu.be/dQw4w9WgXcQ\n\nnot a url\n")
+
+    assert cli._extract_all_ids(input_file) == [
+        (2, "https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        (4, "not a url", None),
+    ]
+
 # This is the end of the file. Ensure no extra lines follow. 
\ No newline at end of file
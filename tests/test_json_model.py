@@ -0,0 +1,30 @@
+import pytest
+
+orjson = pytest.importorskip("orjson")
+
+from youtube_playlist_editor.json_model import OrjsonModel, get_json_model
+
+
+def test_get_json_model_uses_orjson_when_installed():
+    """Tests that the orjson-backed model is selected when orjson is importable."""
+    assert isinstance(get_json_model(), OrjsonModel)
+
+def test_get_json_model_falls_back_without_orjson(mocker):
+    """Tests that None (library default model) is returned when orjson is missing."""
+    mocker.patch("youtube_playlist_editor.json_model.orjson", None)
+    assert get_json_model() is None
+
+def test_orjson_model_round_trip():
+    """Tests that request bodies serialize to JSON text and responses deserialize to dicts."""
+    model = OrjsonModel(data_wrapper=False)
+    body = {"snippet": {"playlistId": "PL_test", "resourceId": {"kind": "youtube#video", "videoId": "dQw4w9WgXcQ"}}}
+
+    serialized = model.serialize(body)
+
+    assert isinstance(serialized, str)
+    assert model.deserialize(serialized.encode("utf-8")) == body
+
+def test_orjson_model_non_json_content():
+    """Tests that non-JSON response bodies are returned as text, like the stdlib model."""
+    model = OrjsonModel(data_wrapper=False)
+    assert model.deserialize(b"not json") == "not json"
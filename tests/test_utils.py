@@ -1,10 +1,14 @@
 # Placeholder for utils tests 
 
+import logging
+import os
+import threading
+
 import pytest
-from youtube_playlist_editor.utils import extract_video_id
+from youtube_playlist_editor.utils import _parse_video_id, extract_video_id, iter_url_lines
 
 # Test cases with expected video IDs
-VALID_URLS = [
+VALID_URLS = (
     ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
     ("http://www.youtube.com/watch?v=dQw4w9WgXcQ&feature=related", "dQw4w9WgXcQ"),
     ("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
@@ -14,20 +18,22 @@ VALID_URLS = [
     ("https://www.youtube.com/shorts/AbCdEfGhIjK", "AbCdEfGhIjK"),
     ("http://www.youtube.com/live/lMnKoJx3yXk?si=abc", "lMnKoJx3yXk"),
     ("youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"), # No protocol
+    ("https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ", "dQw4w9WgXcQ"), # v= not the first parameter
     # Add more valid examples if needed
-]
+)
 
 # Test cases where no video ID should be found
-INVALID_URLS = [
+INVALID_URLS = (
     "https://www.google.com",
     "https://www.youtube.com/watch?v=", # Missing ID
     "https://www.youtube.com/watch?vid=dQw4w9WgXcQ", # Wrong parameter
     "just a string",
     "youtu.be/", # Missing ID
     "https://example.com/dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9W!XcQ", # Invalid character inside the ID
     "", # Empty string
     # Add more invalid examples if needed
-]
+)
 
 @pytest.mark.parametrize("url, expected_id", VALID_URLS)
 def test_extract_video_id_valid(url, expected_id):
@@ -41,8 +47,59 @@ def test_extract_video_id_invalid(url):
 
 def test_extract_video_id_logging(caplog):
     """Tests that a warning is logged for invalid URLs."""
-    import logging
     caplog.set_level(logging.WARNING)
     invalid_url = "https://not_youtube.com/watch?v=invalid"
     extract_video_id(invalid_url)
-    assert f"Could not extract video ID from URL: {invalid_url}" in caplog.text 
\ No newline at end of file
+    assert f"Could not extract video ID from URL: {invalid_url}" in caplog.text 
+
+def test_extract_video_id_repeated_urls(caplog):
+    """Tests that repeated URLs hit the parse cache and misses are still logged every time."""
+    caplog.set_level(logging.WARNING)
+    invalid_url = "https://example.com/repeated"
+    hits_before = _parse_video_id.cache_info().hits
+    for _ in range(2):
+        assert extract_video_id("https://youtu.be/xvFZjo5PgG0?t=1") == "xvFZjo5PgG0"
+        assert extract_video_id(invalid_url) is None
+    assert caplog.text.count(f"Could not extract video ID from URL: {invalid_url}") == 2
+    assert _parse_video_id.cache_info().hits - hits_before >= 2 # Second pass is served from the cache
+
+def test_iter_url_lines_skips_blank_and_comment_lines(tmp_path):
+    """Tests that blank lines and comments are skipped while line numbers are preserved."""
+    input_file = tmp_path / "videos.txt"
+    input_file.write_bytes(b"# header\r\nhttps://youtu.be/dQw4w9WgXcQ\r\n\n   \n  https://www.youtube.com/shorts/AbCdEfGhIjK  \nno newline at end")
+    assert list(iter_url_lines(input_file)) == [
+        (2, "https://youtu.be/dQw4w9WgXcQ"),
+        (5, "https://www.youtube.com/shorts/AbCdEfGhIjK"),
+        (6, "no newline at end"),
+    ]
+
+def test_iter_url_lines_empty_file(tmp_path):
+    """Tests that an empty file yields no lines (mmap cannot map empty files)."""
+    input_file = tmp_path / "empty.txt"
+    input_file.touch()
+    assert list(iter_url_lines(input_file)) == []
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="FIFOs are not available on this platform")
+def test_iter_url_lines_reads_fifo(tmp_path):
+    """Tests that a FIFO (as created by `-f <(grep ...)`) is read line by line instead of as an empty file."""
+    fifo = tmp_path / "videos.fifo"
+    os.mkfifo(fifo)
+    writer = threading.Thread(target=fifo.write_bytes, args=(b"# piped\nhttps://youtu.be/dQw4w9WgXcQ\n\nhttps://youtu.be/oHg5SJYRHA0\n",))
+    writer.start()
+    try:
+        assert list(iter_url_lines(fifo)) == [
+            (2, "https://youtu.be/dQw4w9WgXcQ"),
+            (4, "https://youtu.be/oHg5SJYRHA0"),
+        ]
+    finally:
+        writer.join()
+
+def test_iter_url_lines_falls_back_when_mmap_fails(tmp_path, mocker):
+    """Tests that a regular file that cannot be memory-mapped is still read."""
+    input_file = tmp_path / "videos.txt"
+    input_file.write_bytes(b"https://youtu.be/dQw4w9WgXcQ\n# comment\nno newline at end")
+    mocker.patch("youtube_playlist_editor.utils.mmap.mmap", side_effect=OSError("mmap not supported"))
+    assert list(iter_url_lines(input_file)) == [
+        (1, "https://youtu.be/dQw4w9WgXcQ"),
+        (3, "no newline at end"),
+    ]